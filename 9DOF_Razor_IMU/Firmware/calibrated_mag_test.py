@@ -1,11 +1,13 @@
 import serial
-import serial.tools.list_ports
 import json
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
 import threading
 import time
 
+from imu_serial import find_port, open_serial, read_lines, parse_mag_xy
+
 # --------------------------
 # Load Calibration JSON
 # --------------------------
@@ -23,65 +25,124 @@ print("=== Loaded Magnetometer Calibration ===")
 print(json.dumps(calib, indent=4))
 
 
-# --------------------------
-# Find Serial Port
-# --------------------------
-def find_port():
-    ports = list(serial.tools.list_ports.comports())
-    if not ports:
-        raise Exception("No IMU detected")
-    print(f"Connecting to {ports[0].device}...")
-    return ports[0].device
+def make_apply_cal(off_x, off_y, scale_x, scale_y):
+    """
+    보정 상수를 클로저에 고정한 apply_cal(block, out) 을 만듭니다.
+    block 은 (N, 2) [mx, my] 배열이며, 결과를 out 에 제자리 연산으로 기록합니다.
+    """
+    offset = np.array([off_x, off_y], dtype=np.float32)
+    scale = np.array([scale_x, scale_y], dtype=np.float32)
+
+    def apply_cal(block, out):
+        np.subtract(block, offset, out=out)
+        np.multiply(out, scale, out=out)
+        return out
+    return apply_cal
+
+
+apply_cal = make_apply_cal(mag_offset_x, mag_offset_y, mag_scale_x, mag_scale_y)
 
 
 # --------------------------
-# Shared Buffers
+# Shared Buffers (고정 크기 링버퍼)
 # --------------------------
-raw_x = []
-raw_y = []
-cal_x = []
-cal_y = []
+BUF_N = 4096      # 링버퍼 크기 (약 40초 분량 @100Hz)
+PLOT_N = 1000     # 화면에 표시할 최신 샘플 수
+STAGE_N = 64      # 보정을 한 번에 적용할 샘플 묶음 크기
+
+raw = np.empty((BUF_N, 2), dtype=np.float32)
+cal = np.empty((BUF_N, 2), dtype=np.float32)
+write_idx = 0     # 누적 기록 샘플 수 (serial 스레드만 갱신)
 running = True
 
 
+def latest(buf, end, n):
+    """
+    링버퍼에서 end 직전까지의 최신 n개 샘플을 반환합니다.
+    경계를 넘지 않으면 복사 없이 view 를 돌려줍니다.
+    """
+    n = min(n, end, BUF_N)
+    start = (end - n) % BUF_N
+    stop = start + n
+    if stop <= BUF_N:
+        return buf[start:stop]
+    return np.concatenate((buf[start:], buf[:stop - BUF_N]))
+
+
+def push(buf, end, block):
+    """
+    링버퍼의 end 위치부터 block 을 기록합니다 (경계를 넘으면 둘로 나눠 복사).
+    """
+    start = end % BUF_N
+    n = len(block)
+    first = min(n, BUF_N - start)
+    buf[start:start + first] = block[:first]
+    if first < n:
+        buf[:n - first] = block[first:]
+
+
+def fit_axis(ax, pts, margin=0.1):
+    """
+    데이터가 모두 보이도록 x/y 범위를 같은 폭으로 맞춥니다 (1:1 비율 유지).
+    """
+    lo = pts.min(axis=0)
+    hi = pts.max(axis=0)
+    cx, cy = (lo + hi) / 2.0
+    half = max(float((hi - lo).max()) / 2.0, 1.0) * (1.0 + margin)
+    ax.set_xlim(cx - half, cx + half)
+    ax.set_ylim(cy - half, cy + half)
+
+
 # --------------------------
 # Serial Thread
 # --------------------------
 def serial_thread(port):
     global running
     try:
-        ser = serial.Serial(port, 115200, timeout=1)
-        time.sleep(2)
+        ser = open_serial(port, 115200, timeout=0.05)
     except Exception as e:
         print(f"Serial open error: {e}")
         return
 
+    buf = bytearray()
+    stage = np.empty((STAGE_N, 2), dtype=np.float32)      # raw 샘플 임시 묶음
+    cal_stage = np.empty((STAGE_N, 2), dtype=np.float32)  # 보정 결과 (재사용)
+    n = 0
+
+    def flush(k):
+        # raw / 보정값을 묶음 단위로 저장 (슬롯을 먼저 채운 뒤 인덱스 공개)
+        global write_idx
+        block = stage[:k]
+        push(raw, write_idx, block)
+        push(cal, write_idx, apply_cal(block, cal_stage[:k]))
+        write_idx += k
+
     while running:
         try:
-            line = ser.readline().decode("utf-8", errors="ignore").strip()
-            if not line:
+            lines = read_lines(ser, buf)
+        except serial.SerialException:
+            # 포트 오류 시 바로 재시도하지 않고 잠시 양보 (CPU 100% 방지)
+            time.sleep(0.01)
+            continue
+
+        for raw_line in lines:
+            try:
+                xy = parse_mag_xy(raw_line)
+            except (ValueError, IndexError):
                 continue
-
-            parts = line.split(",")
-            if len(parts) < 10:
+            if xy is None:
                 continue
 
-            mx = float(parts[7])
-            my = float(parts[8])
-
-            # raw 저장
-            raw_x.append(mx)
-            raw_y.append(my)
-
-            # 보정 적용
-            mx_cal = (mx - mag_offset_x) * mag_scale_x
-            my_cal = (my - mag_offset_y) * mag_scale_y
-
-            cal_x.append(mx_cal)
-            cal_y.append(my_cal)
+            stage[n] = xy
+            n += 1
+            if n == STAGE_N:
+                flush(n)
+                n = 0
 
-        except:
-            pass
+        # 화면 지연을 막기 위해 읽기 한 번이 끝나면 남은 샘플도 반영
+        if n:
+            flush(n)
+            n = 0
 
     ser.close()
     print("Serial thread terminated.")
@@ -95,7 +156,6 @@ if __name__ == "__main__":
     t = threading.Thread(target=serial_thread, args=(port,))
     t.start()
 
-    plt.ion()
     fig, ax = plt.subplots(1, 2, figsize=(12, 6))
 
     ax_raw = ax[0]
@@ -110,37 +170,53 @@ if __name__ == "__main__":
     ax_cal.set_xlabel("mx_cal")
     ax_cal.set_ylabel("my_cal")
 
-    ax_raw.axis("equal")
-    ax_cal.axis("equal")
+    ax_raw.set_aspect("equal", adjustable="box")
+    ax_cal.set_aspect("equal", adjustable="box")
+
+    # scatter 아티스트는 한 번만 만들고 좌표만 갱신 (blit 대상)
+    sc_raw = ax_raw.scatter([], [], s=7, color="red", alpha=0.6, animated=True)
+    sc_cal = ax_cal.scatter([], [], s=7, color="blue", alpha=0.6, animated=True)
+
+    AXIS_EVERY = 10   # 축 범위 재계산 주기 (프레임)
 
     print("\nRotate your IMU in all directions...")
     print("This will show RAW vs CALIBRATED magnetic field.\n")
 
-    try:
-        while True:
-            if len(raw_x) > 5:
-                # 최신 1000개만 표시해서 속도 유지
-                rx = raw_x[-1000:]
-                ry = raw_y[-1000:]
-                cx = cal_x[-1000:]
-                cy = cal_y[-1000:]
+    frame = 0
 
-                ax_raw.clear()
-                ax_cal.clear()
+    def update(_):
+        """
+        FuncAnimation 콜백: 링버퍼 최신값으로 scatter 좌표만 갱신합니다.
+        축이 바뀌는 프레임에서만 전체를 다시 그리고, 나머지는 blit 으로 처리합니다.
+        """
+        global frame
+        end = write_idx
+        if end <= 5:
+            return sc_raw, sc_cal
 
-                ax_raw.scatter(rx, ry, s=7, color="red", alpha=0.6)
-                ax_raw.set_title("RAW Magnetometer")
-                ax_raw.axis("equal")
+        # 최신 PLOT_N개만 표시해서 속도 유지
+        r = latest(raw, end, PLOT_N)
+        c = latest(cal, end, PLOT_N)
+        sc_raw.set_offsets(r)
+        sc_cal.set_offsets(c)
 
-                ax_cal.scatter(cx, cy, s=7, color="blue", alpha=0.6)
-                ax_cal.set_title("CALIBRATED Magnetometer")
-                ax_cal.axis("equal")
+        # 축 범위가 바뀌면 배경(눈금 포함)을 새로 그려야 blit 캐시가 갱신됨
+        if frame % AXIS_EVERY == 0:
+            fit_axis(ax_raw, r)
+            fit_axis(ax_cal, c)
+            fig.canvas.draw()
 
-                plt.pause(0.05)
-            else:
-                plt.pause(0.1)
+        frame += 1
+        return sc_raw, sc_cal
 
+    anim = FuncAnimation(fig, update, interval=50, blit=True,
+                         cache_frame_data=False)
+
+    try:
+        plt.show()
     except KeyboardInterrupt:
+        pass
+    finally:
         print("\nStopping...")
         running = False
         t.join()
@@ -1,53 +1,63 @@
-import serial
-import serial.tools.list_ports
 import matplotlib.pyplot as plt
+import serial
 import threading
 import time
 import json  # 파일 저장을 위한 라이브러리 추가
 import numpy as np  # 계산 편의를 위해 numpy 사용 (없으면 pip install numpy 필요)
 
-# 데이터 저장을 위한 리스트
-mx_list = []
-my_list = []
-running = True  # 스레드 제어용 플래그
+from imu_serial import find_port, open_serial, read_lines, parse_mag_xy
+
+# 데이터 저장용 버퍼 (mx, my) - 가득 차면 2배로 확장
+INIT_CAP = 1 << 16
+mag_buf = np.empty((INIT_CAP, 2), dtype=np.float64)
+count = 0  # 기록된 샘플 수 (serial 스레드만 갱신)
 
-# ---- 시리얼 포트 자동 탐색 ----
-def find_port():
-    ports = list(serial.tools.list_ports.comports())
-    if not ports:
-        raise Exception("No IMU detected")
-    print(f"Connecting to {ports[0].device}...")
-    return ports[0].device
+# 축 범위 계산용 누적 최소/최대값 (serial 스레드에서 샘플마다 갱신)
+shared_min = float("inf")
+shared_max = float("-inf")
+
+running = True  # 스레드 제어용 플래그
 
 # ---- 시리얼 읽기 스레드 ----
 def serial_thread(port):
-    global mx_list, my_list, running
+    global mag_buf, count, shared_min, shared_max, running
     try:
-        ser = serial.Serial(port, 115200, timeout=1)
-        time.sleep(2)  # 포트 안정화 대기
+        ser = open_serial(port, 115200, timeout=0.01)  # 첫 연결 시에만 안정화 대기
     except Exception as e:
         print(f"Error opening serial port: {e}")
         return
 
+    buf = bytearray()
     while running:
         try:
-            line = ser.readline().decode("utf-8", errors='ignore').strip()
-            if not line:
-                continue
+            lines = read_lines(ser, buf)
+        except serial.SerialException:
+            # 포트 오류 시 바로 재시도하지 않고 잠시 양보 (CPU 100% 방지)
+            time.sleep(0.01)
+            continue
 
-            parts = line.split(",")
-            # 데이터 포맷에 맞게 인덱스 확인 (사용자 코드 기준 7, 8번이 mx, my)
-            if len(parts) < 10:
-                continue
+        for raw_line in lines:
+            try:
+                # 데이터 포맷에 맞게 인덱스 확인 (사용자 코드 기준 7, 8번이 mx, my)
+                xy = parse_mag_xy(raw_line)
+                if xy is None:
+                    continue
+                mx, my = xy
 
-            mx = float(parts[7])
-            my = float(parts[8])
+                if count == len(mag_buf):
+                    grown = np.empty((2 * len(mag_buf), 2), dtype=np.float64)
+                    grown[:count] = mag_buf
+                    mag_buf = grown
+                mag_buf[count] = (mx, my)
+                count += 1
 
-            mx_list.append(mx)
-            my_list.append(my)
+                if mx < shared_min: shared_min = mx
+                if my < shared_min: shared_min = my
+                if mx > shared_max: shared_max = mx
+                if my > shared_max: shared_max = my
 
-        except Exception:
-            pass
+            except Exception:
+                pass
     
     ser.close()
     print("Serial port closed.")
@@ -57,27 +67,22 @@ def serial_thread(port):
 import numpy as np
 
 def calculate_and_save_calibration():
-    if len(mx_list) < 50:
+    if count < 50:
         print("\n[경고] 데이터가 너무 적어 캘리브레이션을 수행할 수 없습니다.")
         return
 
     print("\n--- Calculating Calibration Data (Hard Iron Only - Raw Scale) ---")
     
-    mx_arr = np.array(mx_list)
-    my_arr = np.array(my_list)
-    
-    # 데이터를 2D 배열로 변환
-    data = np.column_stack([mx_arr, my_arr])
+    # 데이터를 2D 배열로 복사 (N, 2) - 열 0: mx, 열 1: my
+    data = mag_buf[:count].copy()
+    mx_arr = data[:, 0]
+    my_arr = data[:, 1]
 
     # 1. Hard Iron (Offset) - 타원의 중심 찾기
-    # 백분위수 사용하여 노이즈 제거
-    min_x = np.percentile(mx_arr, 1)
-    max_x = np.percentile(mx_arr, 99)
-    min_y = np.percentile(my_arr, 1)
-    max_y = np.percentile(my_arr, 99)
-    
-    mag_offset_x = (max_x + min_x) / 2.0
-    mag_offset_y = (max_y + min_y) / 2.0
+    # 백분위수 사용하여 노이즈 제거 (한 번의 호출로 두 축의 1%/99% 계산)
+    lo, hi = np.percentile(data, [1, 99], axis=0)
+
+    mag_offset_x, mag_offset_y = ((lo + hi) / 2.0).tolist()
     
     # 2. Soft Iron (Scale) - 주석처리 (raw 데이터 그대로 사용)
     # # 중심을 원점으로 이동
@@ -200,30 +205,61 @@ if __name__ == "__main__":
 
         plt.ion()  
         fig, ax = plt.subplots()
-        sc = ax.scatter([], [])
+        sc = ax.scatter([], [], animated=True)  # blit 대상 (배경과 분리해서 그림)
         ax.set_title("Rotate sensor to calibrate (Press Ctrl+C to save)")
         ax.set_xlabel("mx")
         ax.set_ylabel("my")
         ax.axis('equal') # X, Y 비율을 1:1로 고정 (원형 확인 용이)
+        plt.show(block=False)
 
         print("Start rotating the sensor in all directions...")
         
+        AXIS_EVERY = 10  # 축 범위 재조정 주기 (프레임) - 매 프레임 set_xlim 시 전체 재렌더링
+        WARMUP_S = 2.0   # 첫 샘플 이후 이 시간 동안만 축 범위를 조정하고 이후 고정
+        frame = 0
+        t_first = None
+        frozen = False
+        bg = None
         while True:
-            if len(mx_list) > 0:
+            n = count
+            if n > 0:
                 # 성능을 위해 최신 500개 점만 표시하거나 전체 표시
-                sc.set_offsets(list(zip(mx_list, my_list)))
-                
-                # 축 범위 동적 조정
-                cur_min = min(min(mx_list), min(my_list))
-                cur_max = max(max(mx_list), max(my_list))
-                margin = (cur_max - cur_min) * 0.1
-                
-                ax.set_xlim(cur_min - margin, cur_max + margin)
-                ax.set_ylim(cur_min - margin, cur_max + margin)
+                sc.set_offsets(mag_buf[:n])
                 
-                plt.pause(0.05)
-            else:
-                plt.pause(0.1)
+                redraw = bg is None
+                if not frozen:
+                    if t_first is None:
+                        t_first = time.monotonic()
+
+                    if time.monotonic() - t_first >= WARMUP_S:
+                        # 워밍업 데이터의 견고한 범위(0.5~99.5%)로 축을 한 번 고정
+                        lo, hi = np.percentile(mag_buf[:n], [0.5, 99.5])
+                        margin = (hi - lo) * 0.1
+                        ax.set_xlim(lo - margin, hi + margin)
+                        ax.set_ylim(lo - margin, hi + margin)
+                        frozen = True
+                        redraw = True
+                    elif frame % AXIS_EVERY == 0:
+                        # 축 범위 동적 조정 (AXIS_EVERY 프레임마다 한 번)
+                        cur_min = shared_min
+                        cur_max = shared_max
+                        margin = (cur_max - cur_min) * 0.1
+                        
+                        ax.set_xlim(cur_min - margin, cur_max + margin)
+                        ax.set_ylim(cur_min - margin, cur_max + margin)
+                        redraw = True
+                frame += 1
+
+                # 축이 바뀐 경우에만 전체를 그리고 배경을 캐시, 나머지는 blit
+                if redraw:
+                    fig.canvas.draw()
+                    bg = fig.canvas.copy_from_bbox(ax.bbox)
+                fig.canvas.restore_region(bg)
+                ax.draw_artist(sc)
+                fig.canvas.blit(ax.bbox)
+
+            fig.canvas.flush_events()
+            time.sleep(0.05 if n > 0 else 0.1)
 
     except KeyboardInterrupt:
         print("\nStopping data collection...")
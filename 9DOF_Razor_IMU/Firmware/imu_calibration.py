@@ -7,35 +7,32 @@ def quat_conj(q):
     w, x, y, z = q
     return np.array([w, -x, -y, -z], dtype=float)
 
-def quat_mul(q1, q2):
+def quat_mul_batch(q1, Q2):
+    """q1(4,) 을 Q2(N,4) 의 모든 행에 왼쪽에서 곱합니다."""
     w1, x1, y1, z1 = q1
-    w2, x2, y2, z2 = q2
-    return np.array([
+    w2, x2, y2, z2 = Q2.T
+    return np.stack([
         w1*w2 - x1*x2 - y1*y2 - z1*z2,
         w1*x2 + x1*w2 + y1*z2 - z1*y2,
         w1*y2 - x1*z2 + y1*w2 + z1*x2,
         w1*z2 + x1*y2 - y1*x2 + z1*w2
-    ], dtype=float)
+    ], axis=1)
 
-def quat_to_euler_zyx(q):
-    w, x, y, z = q
+def quat_to_euler_zyx_batch(Q):
+    """Q(N,4) -> (N,3) [roll, pitch, yaw] (deg)"""
+    w, x, y, z = Q.T
+    out = np.empty((len(Q), 3))
 
-    # roll(x)
-    sinr = 2*(w*x + y*z)
-    cosr = 1 - 2*(x*x + y*y)
-    roll = np.degrees(np.arctan2(sinr, cosr))
+    # 각 결과를 out 열에 바로 기록 (stack/clip 임시 배열 생략)
+    np.arctan2(2*(w*x + y*z), 1 - 2*(x*x + y*y), out=out[:, 0])
 
-    # pitch(y)
-    sinp = 2*(w*y - z*x)
-    sinp = np.clip(sinp, -1, 1)
-    pitch = np.degrees(np.arcsin(sinp))
+    s = 2*(w*y - z*x)
+    np.clip(s, -1, 1, out=s)
+    np.arcsin(s, out=out[:, 1])
 
-    # yaw(z)
-    siny = 2*(w*z + x*y)
-    cosy = 1 - 2*(y*y + z*z)
-    yaw = np.degrees(np.arctan2(siny, cosy))
+    np.arctan2(2*(w*z + x*y), 1 - 2*(y*y + z*z), out=out[:, 2])
 
-    return roll, pitch, yaw
+    return np.degrees(out, out=out)
 
 
 # -----------------------------
@@ -43,11 +40,10 @@ def quat_to_euler_zyx(q):
 # -----------------------------
 filename = "imu_log_20251212_015611.csv"  # 여기에 파일명 넣기
 
-data = np.genfromtxt(filename, delimiter=",", skip_header=1)
-
 quat_cols = (10, 11, 12, 13)
 
-q_raw = data[:, quat_cols]
+# 쿼터니언 4개 컬럼만 C 파서로 읽음 (나머지 컬럼은 파싱하지 않음)
+q_raw = np.loadtxt(filename, delimiter=",", skiprows=1, usecols=quat_cols, ndmin=2)
 q_raw /= np.linalg.norm(q_raw, axis=1, keepdims=True)
 
 
@@ -67,18 +63,15 @@ print("q_offset =", q_offset)
 # -----------------------------
 # 4) 보정 적용
 # -----------------------------
-q_corr = np.array([
-    quat_mul(q_offset, q_raw[i])
-    for i in range(len(q_raw))
-])
+q_corr = quat_mul_batch(q_offset, q_raw)
 q_corr /= np.linalg.norm(q_corr, axis=1, keepdims=True)
 
 
 # -----------------------------
 # 5) Euler 변환
 # -----------------------------
-rpy_raw = np.array([quat_to_euler_zyx(q) for q in q_raw])
-rpy_corr = np.array([quat_to_euler_zyx(q) for q in q_corr])
+rpy_raw = quat_to_euler_zyx_batch(q_raw)
+rpy_corr = quat_to_euler_zyx_batch(q_corr)
 
 print("보정 전 RPY 평균:", rpy_raw[:N].mean(axis=0))
 print("보정 후 RPY 평균:", rpy_corr[:N].mean(axis=0))
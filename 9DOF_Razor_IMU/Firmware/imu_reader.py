@@ -7,12 +7,33 @@ SparkFun 9DoF Razor IMU M0 - FULL 데이터 출력 + CSV 기록 Python 스크립
 import serial
 import serial.tools.list_ports
 import sys
+import os
 import time
+import argparse
 import datetime
 import csv
+import struct
+import numpy as np
+
+from imu_serial import open_serial
+
+# --post 후처리용 (선택): 없으면 후처리만 건너뜀
+try:
+    from scipy.spatial.transform import Rotation
+except ImportError:
+    Rotation = None
 
 BAUD_RATE = 115200
 
+CSV_BATCH = 64         # 이만큼 모이면 한 번에 기록
+CSV_FLUSH_SEC = 0.5    # 또는 이 시간이 지나면 기록
+
+# 바이너리 프레임 모드 (펌웨어가 지원할 때만 --binary 로 사용)
+# [0xAA 0x55][float32 x 15, little-endian] = 62 bytes
+BINARY_MODE = False
+FRAME_SYNC = b"\xAA\x55"
+FRAME = struct.Struct("<15f")
+
 
 # -------------------------------------------
 # 포트 자동 검색
@@ -43,12 +64,31 @@ def find_imu_port():
 # -------------------------------------------
 # CSV 파싱
 # -------------------------------------------
+IMU_FIELDS = 15
+
+
 def parse_imu_data(line):
+    # 필드 수를 먼저 확인하고 한 번에 float 배열로 변환 (형식이 다르면 None)
+    # np.fromstring(sep=",") 은 잘못된 줄에서 경고와 함께 짧은 배열을 조용히 돌려주므로 쓰지 않음
+    parts = line.split(b",")
+    if len(parts) != IMU_FIELDS:
+        return None
     try:
-        values = [float(v.strip()) for v in line.split(',')]
-        return values
-    except:
+        return np.array(parts, dtype=np.float64)
+    except ValueError:
+        return None
+
+
+def parse_imu_binary(payload):
+    # 동기 바이트 뒤 60바이트 → float 15개 (ASCII 변환 없음)
+    if len(payload) != FRAME.size:
         return None
+    return FRAME.unpack(payload)
+
+
+def read_imu_binary(ser):
+    ser.read_until(FRAME_SYNC)   # 동기 바이트까지 버림
+    return parse_imu_binary(ser.read(FRAME.size))
 
 
 # -------------------------------------------
@@ -72,10 +112,56 @@ def print_full_output(values):
         print(f"\r[{N} values] {values}", end="", flush=True)
 
 
+# -------------------------------------------
+# 기록 후 일괄 Euler 변환 (--post)
+# -------------------------------------------
+def post_process(filename):
+    """
+    저장된 CSV 를 다시 읽어 쿼터니언(qw,qx,qy,qz) 전체를 한 번에 Euler 로 변환하고
+    roll/pitch/yaw 열을 붙인 *_euler.csv 를 만듭니다.
+    """
+    if Rotation is None:
+        print("⚠️ scipy 가 없어 후처리를 건너뜁니다. (pip install scipy)")
+        return
+
+    data = np.loadtxt(filename, delimiter=",", skiprows=1, ndmin=2)
+    if len(data) == 0:
+        print("⚠️ 기록된 데이터가 없어 후처리를 건너뜁니다.")
+        return
+
+    # scipy 는 (x, y, z, w) 순서
+    quat = data[:, [11, 12, 13, 10]]
+    # 잘린/깨진 줄에서 나온 크기 0(또는 nan) 쿼터니언은 from_quat 이 ValueError 를 내므로 제외
+    valid = np.linalg.norm(quat, axis=1) > 0
+    if not valid.all():
+        print(f"⚠️ 쿼터니언 크기가 0 인 행 {np.count_nonzero(~valid)}개를 제외합니다.")
+        data, quat = data[valid], quat[valid]
+        if len(data) == 0:
+            print("⚠️ 유효한 쿼터니언이 없어 후처리를 건너뜁니다.")
+            return
+    rot = Rotation.from_quat(quat)
+    ypr = rot.as_euler("ZYX", degrees=True)  # (yaw, pitch, roll)
+
+    out = np.column_stack([data, ypr[:, 2], ypr[:, 1], ypr[:, 0]])
+    out_name = filename[:-4] + "_euler.csv"
+    with open(filename, "r") as f:
+        header = f.readline().strip()
+    np.savetxt(out_name, out, delimiter=",", fmt="%.6f",
+               header=header + ",roll,pitch,yaw", comments="")
+    print(f"💾 Euler 후처리 저장 완료: {out_name}")
+
+
 # -------------------------------------------
 # 메인 루프
 # -------------------------------------------
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--post", action="store_true",
+                        help="종료 시 CSV 쿼터니언을 일괄 Euler 변환 (scipy 필요)")
+    parser.add_argument("--binary", action="store_true", default=BINARY_MODE,
+                        help="바이너리 프레임(0xAA55 + float32 x 15) 수신")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("🎯 SparkFun 9DoF Razor IMU M0 - FULL 데이터 리더 + CSV 기록")
     print("=" * 60)
@@ -86,8 +172,7 @@ def main():
 
     print(f"\n🔗 {port} 연결 중... ({BAUD_RATE} baud)")
     try:
-        ser = serial.Serial(port, BAUD_RATE, timeout=1)
-        time.sleep(2)
+        ser = open_serial(port, BAUD_RATE, timeout=1)
 
         print("✅ 연결 성공")
 
@@ -96,8 +181,10 @@ def main():
         # -------------------------------
         now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"imu_log_{now}.csv"
-        csv_file = open(filename, "w", newline="")
+        csv_file = open(filename, "w", newline="", buffering=1 << 20)
         csv_writer = csv.writer(csv_file)
+        pending = []                      # 아직 기록하지 않은 행
+        last_flush = time.monotonic()
 
         # CSV 헤더
         header = [
@@ -117,22 +204,34 @@ def main():
         # 수신 루프
         # -------------------------------
         while True:
-            if ser.in_waiting:
-                line = ser.readline().decode("utf-8", errors="ignore").strip()
+            if args.binary:
+                values = read_imu_binary(ser)
+                if values is None:
+                    continue
+                row = list(values)
+            else:
+                # readline() 이 timeout 까지 tty 에서 블로킹 대기 (in_waiting 폴링 불필요)
+                line = ser.readline().rstrip()
                 if not line:
                     continue
 
                 values = parse_imu_data(line)
+                row = values.tolist() if values is not None else None
 
-                if values and len(values) == 15:
-                    print_full_output(values)
+            if row is not None:
+                print_full_output(values)
 
-                    # CSV에 저장
-                    csv_writer.writerow(values)
+                # CSV에 저장 (행을 모았다가 일괄 기록)
+                pending.append(row)
+                now_t = time.monotonic()
+                if len(pending) >= CSV_BATCH or now_t - last_flush >= CSV_FLUSH_SEC:
+                    csv_writer.writerows(pending)
+                    pending.clear()
+                    last_flush = now_t
 
-                else:
-                    # CSV형태가 아닌 메시지
-                    print(f"\n📝 메시지: {line}")
+            else:
+                # CSV형태가 아닌 메시지
+                print(f"\n📝 메시지: {line.decode('utf-8', errors='ignore')}")
 
     except KeyboardInterrupt:
         print("\n\n👋 종료합니다.")
@@ -140,10 +239,17 @@ def main():
         print(f"\n❌ 시리얼 오류: {e}")
     finally:
         try:
+            if pending:
+                csv_writer.writerows(pending)
+            csv_file.flush()
+            os.fsync(csv_file.fileno())
             csv_file.close()
             print(f"💾 CSV 파일 저장 완료: {filename}")
         except:
             pass
+        else:
+            if args.post:
+                post_process(filename)
 
 
 if __name__ == "__main__":
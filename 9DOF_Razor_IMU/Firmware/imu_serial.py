@@ -0,0 +1,122 @@
+"""
+Razor IMU 시리얼 수신 공통 모듈
+- 포트 자동 탐색
+- 리셋 없는 포트 열기 (DTR/RTS off) + 마지막 포트 캐시
+- USB 시리얼 저지연 모드 설정
+- UART 버퍼 일괄 읽기 + 줄 단위 분리
+- 자력계(mx, my) 필드 파싱
+
+calibrated_mag_test.py / calibration_soft_hard.py 에서 함께 사용합니다.
+"""
+
+import json
+import os
+import time
+
+import serial
+import serial.tools.list_ports
+
+# 마지막 포트 캐시는 저장소 밖 사용자 캐시 디렉토리에 둠 (작업 트리에 파일을 남기지 않음)
+LAST_PORT_FILE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "jetracer", "last_port.json",
+)
+FIRST_CONNECT_WAIT = 1.0  # 처음 보는 포트일 때만 보드 부팅 대기 (초)
+
+MAX_PENDING = 4096  # 개행 없이 쌓일 수 있는 최대 바이트
+
+# SparkFun CSV 포맷 기준 자력계 인덱스 (time, ax, ay, az, gx, gy, gz, mx, my, ...)
+MX_IDX = 7
+MY_IDX = 8
+MIN_FIELDS = 10
+
+
+def find_port():
+    ports = list(serial.tools.list_ports.comports())
+    if not ports:
+        raise Exception("No IMU detected")
+    print(f"Connecting to {ports[0].device}...")
+    return ports[0].device
+
+
+def enable_low_latency(ser):
+    """
+    USB 시리얼(FTDI/ACM)의 ASYNC_LOW_LATENCY 플래그를 켭니다.
+    기본 latency timer(16ms) 때문에 샘플이 묶여서 들어오는 현상을 줄입니다.
+    Linux 전용이며, 지원하지 않는 환경에서는 조용히 넘어갑니다.
+    """
+    try:
+        ser.set_low_latency_mode(True)
+        return True
+    except (AttributeError, NotImplementedError, ValueError, OSError):
+        return False
+
+
+def _load_last_port():
+    try:
+        with open(LAST_PORT_FILE, "r") as f:
+            return json.load(f).get("port")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _save_last_port(port):
+    try:
+        os.makedirs(os.path.dirname(LAST_PORT_FILE), exist_ok=True)
+        with open(LAST_PORT_FILE, "w") as f:
+            json.dump({"port": port}, f)
+    except OSError:
+        pass
+
+
+def open_serial(port, baud=115200, timeout=1):
+    """
+    DTR/RTS 를 내린 상태로 포트를 열어 보드 auto-reset 을 피합니다.
+    리셋이 없으므로 고정 2초 대기 대신, 포트 캐시(LAST_PORT_FILE)에 없는
+    새 포트일 때만 FIRST_CONNECT_WAIT 만큼 기다립니다.
+    """
+    ser = serial.Serial()
+    ser.port = port
+    ser.baudrate = baud
+    ser.timeout = timeout
+    ser.dtr = False
+    ser.rts = False
+    ser.open()
+    enable_low_latency(ser)
+
+    if _load_last_port() != port:
+        time.sleep(FIRST_CONNECT_WAIT)
+        _save_last_port(port)
+    return ser
+
+
+def read_lines(ser, buf):
+    """
+    UART 수신 버퍼에 쌓인 바이트를 한 번에 읽어 완성된 줄 목록을 반환합니다.
+    마지막 미완성 줄은 buf 에 남겨 다음 호출에서 이어 붙입니다.
+    """
+    buf += ser.read(max(1, ser.in_waiting))
+    nl = buf.rfind(b"\n")
+    if nl < 0:
+        if len(buf) > MAX_PENDING:
+            del buf[:]  # 개행 없는 쓰레기 데이터 폐기
+        return []
+    lines = buf[:nl].split(b"\n")
+    del buf[:nl + 1]
+    return lines
+
+
+def parse_mag_xy(raw_line):
+    """
+    한 줄(bytes)에서 (mx, my) 를 꺼냅니다. 형식이 맞지 않으면 None.
+    float() 가 bytes 를 직접 받으므로 decode 하지 않습니다.
+    """
+    line = raw_line.rstrip()
+    if not line:
+        return None
+
+    parts = line.split(b",")
+    if len(parts) < MIN_FIELDS:
+        return None
+
+    return float(parts[MX_IDX]), float(parts[MY_IDX])
@@ -8,53 +8,57 @@ Mag Heading + 1D Kalman + Quaternion Offset Correction
 
 import serial
 import serial.tools.list_ports
+import sys
 import time
 import math
 import json
 import os
-import numpy as np
+
+from imu_serial import open_serial
 
 BAUD_RATE = 115200
+PRINT_PERIOD = 0.05  # 화면 갱신 주기 (20Hz) - 계산/필터는 매 샘플 수행
 CALIBRATION_FILE = os.path.join(os.path.dirname(__file__), "mag_calibration.json")
 
 # ==========================================
 # 1) Quaternion Utils
 # ==========================================
-def quat_conj(q):
+def quat_normalize(q):
+    # 스칼라 연산으로 정규화 (샘플마다 ndarray 생성 방지), 크기 0 이면 None
     w, x, y, z = q
-    return np.array([w, -x, -y, -z], dtype=float)
-
-def quat_mul(q1, q2):
-    w1, x1, y1, z1 = q1
-    w2, x2, y2, z2 = q2
-    return np.array([
-        w1*w2 - x1*x2 - y1*y2 - z1*z2,
-        w1*x2 + x1*w2 + y1*z2 - z1*y2,
-        w1*y2 - x1*z2 + y1*w2 + z1*x2,
-        w1*z2 + x1*y2 - y1*x2 + z1*w2
-    ], dtype=float)
-
-def quat_to_euler_zyx(q):
+    n = math.sqrt(w*w + x*x + y*y + z*z)
+    if n == 0.0:
+        return None
+    inv = 1.0 / n
+    return (w*inv, x*inv, y*inv, z*inv)
+
+def quat_to_matrix(q):
+    # 단위 쿼터니언 -> 3x3 회전행렬 (행 단위 튜플)
     w, x, y, z = q
-
-    # roll
-    sinr = 2*(w*x + y*z)
-    cosr = 1 - 2*(x*x + y*y)
-    roll = math.degrees(math.atan2(sinr, cosr))
-
-    # pitch
-    sinp = 2*(w*y - z*x)
-    sinp = max(-1.0, min(1.0, sinp))
-    pitch = math.degrees(math.asin(sinp))
-
-    # yaw
-    siny = 2*(w*z + x*y)
-    cosy = 1 - 2*(y*y + z*z)
-    yaw = math.degrees(math.atan2(siny, cosy))
-
-    if yaw < 0:
-        yaw += 360
-    return roll, pitch, yaw
+    return (
+        (1 - 2*(y*y + z*z), 2*(x*y - w*z),     2*(x*z + w*y)),
+        (2*(x*y + w*z),     1 - 2*(x*x + z*z), 2*(y*z - w*x)),
+        (2*(x*z - w*y),     2*(y*z + w*x),     1 - 2*(x*x + y*y)),
+    )
+
+def make_corrected_yaw(q_off):
+    """
+    고정 오프셋 q_off 를 회전행렬로 한 번만 바꿔 두고,
+    q_off ⊗ q 의 yaw(deg, 0~360)를 쿼터니언 곱/재정규화 없이 계산하는 함수를 만듭니다.
+    yaw = atan2(R[1,0], R[0,0]) 이므로 R_raw 의 첫 번째 열만 있으면 됩니다.
+    """
+    (a00, a01, a02), (a10, a11, a12), _ = quat_to_matrix(quat_normalize(q_off))
+
+    def corrected_yaw(w, x, y, z):
+        c0 = 1 - 2*(y*y + z*z)
+        c1 = 2*(x*y + w*z)
+        c2 = 2*(x*z - w*y)
+        yaw = math.degrees(math.atan2(a10*c0 + a11*c1 + a12*c2,
+                                      a00*c0 + a01*c1 + a02*c2))
+        if yaw < 0:
+            yaw += 360
+        return yaw
+    return corrected_yaw
 
 # ==========================================
 # 2) q_offset 설정
@@ -62,8 +66,9 @@ def quat_to_euler_zyx(q):
 # 네가 실제로 얻은 보정값 직접 입력:
 # q_calib = [0.01999816, 0.52183147, 0.85172901, 0.04300796]
 # q_offset = conjugate(q_calib)
-q_offset = np.array([ 0.0180163, 0.9926568, -0.11775514, 0.02101488])
-# q_offset = np.array([-0.00454261, 0.78627062, 0.61766535, 0.01572884])
+q_offset = ( 0.0180163, 0.9926568, -0.11775514, 0.02101488)
+# q_offset = (-0.00454261, 0.78627062, 0.61766535, 0.01572884)
+corrected_yaw = make_corrected_yaw(q_offset)
 
 # ==========================================
 # 3) Kalman Filter
@@ -82,20 +87,18 @@ class SimpleKalman1D:
             self.first_run = False
             return self.x
 
-        self.P = self.P + self.Q
+        P = self.P + self.Q
+        x = self.x
 
-        delta = measurement - self.x
-        if delta > 180: delta -= 360
-        elif delta < -180: delta += 360
+        # 각도 차이를 [-180, 180) 로 (분기 없이 modulo 한 번)
+        delta = (measurement - x + 180.0) % 360.0 - 180.0
 
-        K = self.P / (self.P + self.R)
-        self.x += K * delta
-        self.P = (1 - K) * self.P
+        K = P / (P + self.R)
+        x = (x + K * delta) % 360.0
 
-        if self.x < 0: self.x += 360
-        elif self.x >= 360: self.x -= 360
-
-        return self.x
+        self.P = (1 - K) * P
+        self.x = x
+        return x
 
 # ==========================================
 # 4) Utility
@@ -121,22 +124,19 @@ def find_port():
     return ports[0].device
 
 def parse_imu_data(line):
-    parts = line.split(',')
+    # (mx, my, qw, qx, qy, qz, hdg_fw) 튜플 - 샘플마다 dict 를 만들지 않음
+    parts = line.split(b',')
     if len(parts) >= 15:
-        return {
-            "mx": float(parts[7]),
-            "my": float(parts[8]),
-            "qw": float(parts[10]),
-            "qx": float(parts[11]),
-            "qy": float(parts[12]),
-            "qz": float(parts[13]),
-            "hdg_fw": float(parts[14])
-        }
+        return (
+            float(parts[7]), float(parts[8]),
+            float(parts[10]), float(parts[11]), float(parts[12]), float(parts[13]),
+            float(parts[14]),
+        )
     return None
 
-def simple_heading(mx, my, cal):
-    mx = (mx - cal["mag_offset_x"]) * cal["mag_scale_x"]
-    my = (my - cal["mag_offset_y"]) * cal["mag_scale_y"]
+def simple_heading(mx, my, ox, oy, sx, sy):
+    mx = (mx - ox) * sx
+    my = (my - oy) * sy
 
     heading = math.degrees(math.atan2(my, mx))
     if heading < 0:
@@ -152,49 +152,55 @@ def main():
     print("=" * 60)
 
     cal = load_calibration()
+    # 샘플마다 dict 조회하지 않도록 보정값을 지역 변수로 고정
+    ox, oy = cal["mag_offset_x"], cal["mag_offset_y"]
+    sx, sy = cal["mag_scale_x"], cal["mag_scale_y"]
     port = find_port()
-    ser = serial.Serial(port, BAUD_RATE, timeout=1)
+    ser = open_serial(port, BAUD_RATE, timeout=1)
 
     kf = SimpleKalman1D(R=0.2, Q=0.005)
 
     print("\n📡 IMU streaming...\n")
 
+    last_print = 0.0
     while True:
-        line = ser.readline().decode("utf-8", errors="ignore").strip()
+        line = ser.readline().rstrip()
         if not line:
             continue
 
         d = parse_imu_data(line)
         if not d:
             continue
+        mx, my, qw, qx, qy, qz, _ = d
 
         # -----------------------------
         # ① Quaternion correction
         # -----------------------------
-        q_raw = np.array([d["qw"], d["qx"], d["qy"], d["qz"]], dtype=float)
-        q_raw = q_raw / np.linalg.norm(q_raw)
-
-        q_corr = quat_mul(q_offset, q_raw)
-        q_corr = q_corr / np.linalg.norm(q_corr)
+        q_raw = quat_normalize((qw, qx, qy, qz))
+        if q_raw is None:
+            continue
 
-        roll, pitch, yaw_q = quat_to_euler_zyx(q_corr)
+        yaw_q = corrected_yaw(*q_raw)
 
         # -----------------------------
         # ② Magnetometer heading
         # -----------------------------
-        h_mag = simple_heading(d["mx"], d["my"], cal)
+        h_mag = simple_heading(mx, my, ox, oy, sx, sy)
 
         # -----------------------------
         # ③ Kalman Filter
         # -----------------------------
         h_filtered = kf.update(h_mag)
 
-        print(
-            f"\rQ-Yaw:{yaw_q:6.1f}° | "
-            f"Mag:{h_mag:6.1f}° | "
-            f"Filt:{h_filtered:6.1f}°",
-            end=""
-        )
+        now = time.monotonic()
+        if now - last_print >= PRINT_PERIOD:
+            sys.stdout.write(
+                f"\rQ-Yaw:{yaw_q:6.1f}° | "
+                f"Mag:{h_mag:6.1f}° | "
+                f"Filt:{h_filtered:6.1f}°"
+            )
+            sys.stdout.flush()
+            last_print = now
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 import serial
 import serial.tools.list_ports
+import sys
 import time
 import math
 
+from imu_serial import open_serial
+
 
 BAUD_RATE = 115200
+PRINT_PERIOD = 0.05  # 화면 갱신 주기 (20Hz)
 
 
 # -----------------------------
@@ -60,20 +64,20 @@ def quat_to_rp(qw, qx, qy, qz):
 # -----------------------------
 def main():
     port = find_port()
-    ser = serial.Serial(port, BAUD_RATE, timeout=1)
-    time.sleep(2)
+    ser = open_serial(port, BAUD_RATE, timeout=1)
 
     print("\n📡 Roll/Pitch Accuracy Test Running...")
     print("보드를 천천히 좌/우, 앞/뒤로 기울여보세요.")
     print("Ctrl+C로 종료\n")
 
+    last_print = 0.0
     try:
         while True:
-            line = ser.readline().decode("utf-8", errors="ignore").strip()
+            line = ser.readline().rstrip()
             if not line:
                 continue
 
-            parts = line.split(",")
+            parts = line.split(b",")
 
             if len(parts) < 14:
                 continue
@@ -91,12 +95,14 @@ def main():
             a_roll, a_pitch = accel_to_rp(ax, ay, az)
             q_roll, q_pitch = quat_to_rp(qw, qx, qy, qz)
 
-            print(
-                f"\rACC RP = R:{a_roll:6.2f}°  P:{a_pitch:6.2f}°   |   "
-                f"QUAT RP = R:{q_roll:6.2f}°  P:{q_pitch:6.2f}°",
-                end="",
-                flush=True
-            )
+            now = time.monotonic()
+            if now - last_print >= PRINT_PERIOD:
+                sys.stdout.write(
+                    f"\rACC RP = R:{a_roll:6.2f}°  P:{a_pitch:6.2f}°   |   "
+                    f"QUAT RP = R:{q_roll:6.2f}°  P:{q_pitch:6.2f}°"
+                )
+                sys.stdout.flush()
+                last_print = now
 
     except KeyboardInterrupt:
         print("\n\n종료합니다.")
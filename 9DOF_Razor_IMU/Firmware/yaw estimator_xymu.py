@@ -9,40 +9,62 @@ Quaternion Yaw Estimator (DMP-based, 10-field format)
 
 import serial
 import serial.tools.list_ports
+import sys
 import time
 import math
 import numpy as np
 
+from imu_serial import open_serial
+
 BAUD_RATE = 115200
+PRINT_PERIOD = 0.05  # 화면 갱신 주기 (20Hz)
 
 # ==========================================
 # Quaternion Utils
 # ==========================================
-def quat_mul(q1, q2):
-    w1, x1, y1, z1 = q1
-    w2, x2, y2, z2 = q2
-    return np.array([
-        w1*w2 - x1*x2 - y1*y2 - z1*z2,
-        w1*x2 + x1*w2 + y1*z2 - z1*y2,
-        w1*y2 - x1*z2 + y1*w2 + z1*x2,
-        w1*z2 + x1*y2 - y1*x2 + z1*w2
-    ], dtype=float)
-
-def quat_to_yaw(q):
+def quat_normalize(q):
+    # 스칼라 연산으로 정규화 (샘플마다 ndarray 생성 방지), 크기 0 이면 None
     w, x, y, z = q
-    siny = 2*(w*z + x*y)
-    cosy = 1 - 2*(y*y + z*z)
-    yaw = math.degrees(math.atan2(siny, cosy))
-    if yaw < 0:
-        yaw += 360
-    return yaw
+    n = math.sqrt(w*w + x*x + y*y + z*z)
+    if n == 0.0:
+        return None
+    inv = 1.0 / n
+    return (w*inv, x*inv, y*inv, z*inv)
+
+def quat_to_matrix(q):
+    # 단위 쿼터니언 -> 3x3 회전행렬 (행 단위 튜플)
+    w, x, y, z = q
+    return (
+        (1 - 2*(y*y + z*z), 2*(x*y - w*z),     2*(x*z + w*y)),
+        (2*(x*y + w*z),     1 - 2*(x*x + z*z), 2*(y*z - w*x)),
+        (2*(x*z - w*y),     2*(y*z + w*x),     1 - 2*(x*x + y*y)),
+    )
+
+def make_corrected_yaw(q_off):
+    """
+    고정 오프셋 q_off 를 회전행렬로 한 번만 바꿔 두고,
+    q_off ⊗ q 의 yaw(deg, 0~360)를 쿼터니언 곱/재정규화 없이 계산하는 함수를 만듭니다.
+    yaw = atan2(R[1,0], R[0,0]) 이므로 R_raw 의 첫 번째 열만 있으면 됩니다.
+    """
+    (a00, a01, a02), (a10, a11, a12), _ = quat_to_matrix(quat_normalize(q_off))
+
+    def corrected_yaw(w, x, y, z):
+        c0 = 1 - 2*(y*y + z*z)
+        c1 = 2*(x*y + w*z)
+        c2 = 2*(x*z - w*y)
+        yaw = math.degrees(math.atan2(a10*c0 + a11*c1 + a12*c2,
+                                      a00*c0 + a01*c1 + a02*c2))
+        if yaw < 0:
+            yaw += 360
+        return yaw
+    return corrected_yaw
 
 # ==========================================
 # Installation Quaternion Offset
 # ==========================================
 # 네가 실험으로 얻은 값 유지
-q_offset = np.array([0.0180163, 0.9926568, -0.11775514, 0.02101488])
-q_offset = q_offset / np.linalg.norm(q_offset)
+q_offset = quat_normalize((0.0180163, 0.9926568, -0.11775514, 0.02101488))
+corrected_yaw = make_corrected_yaw(q_offset)
 
 # ==========================================
 # Serial Utils
@@ -72,21 +94,18 @@ def parse_imu_data_10(line):
     """
     try:
         s = line.strip()
-        if s.startswith("#"):
-            s = s.strip("#")
-        if "XYMU=" in s:
-            s = s.split("XYMU=", 1)[1]
-
-        v = [float(x) for x in s.split(",")]
-        if len(v) != 10:
+        if s[:1] == b"#":
+            s = s.strip(b"#")
+        if b"XYMU=" in s:
+            s = s.split(b"XYMU=", 1)[1]
+
+        # 필드 수 확인 후 한 번에 변환 (필드 인덱스는 위 docstring 참고)
+        # np.fromstring(sep=",") 은 잘못된 줄에서 경고와 함께 짧은 배열을 돌려주므로 쓰지 않음
+        parts = s.split(b",")
+        if len(parts) != 10:
             return None
 
-        return {
-            "qw": v[6],
-            "qx": v[7],
-            "qy": v[8],
-            "qz": v[9],
-        }
+        return np.array(parts, dtype=np.float64)
     except:
         return None
 
@@ -101,30 +120,32 @@ def main():
     port = find_port()
     print(f"[IMU] port = {port}")
 
-    ser = serial.Serial(port, BAUD_RATE, timeout=1)
-    time.sleep(1.0)
+    ser = open_serial(port, BAUD_RATE, timeout=1)
 
     print("\n📡 IMU streaming (Ctrl+C to stop)\n")
 
+    last_print = 0.0
     try:
         while True:
-            line = ser.readline().decode("utf-8", errors="ignore").strip()
+            line = ser.readline().rstrip()
             if not line:
                 continue
 
-            d = parse_imu_data_10(line)
-            if not d:
+            v = parse_imu_data_10(line)
+            if v is None:
                 continue
 
-            q_raw = np.array([d["qw"], d["qx"], d["qy"], d["qz"]], dtype=float)
-            q_raw = q_raw / np.linalg.norm(q_raw)
-
-            q_corr = quat_mul(q_offset, q_raw)
-            q_corr = q_corr / np.linalg.norm(q_corr)
+            q_raw = quat_normalize(v[6:10].tolist())
+            if q_raw is None:
+                continue
 
-            yaw = quat_to_yaw(q_corr)
+            yaw = corrected_yaw(*q_raw)
 
-            print(f"\rYaw: {yaw:6.2f}°", end="", flush=True)
+            now = time.monotonic()
+            if now - last_print >= PRINT_PERIOD:
+                sys.stdout.write(f"\rYaw: {yaw:6.2f}°")
+                sys.stdout.flush()
+                last_print = now
 
     except KeyboardInterrupt:
         print("\n\n👋 종료")
@@ -1,31 +1,61 @@
 import traitlets
-from adafruit_servokit import ServoKit
+import atexit
+import functools
 import json
+import os
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 from pathlib import Path
 
-from .racecar import Racecar
+from .racecar import Racecar, _CLIP_LO, _CLIP_HI
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _JSON_ERRORS = (orjson.JSONDecodeError,)
+except ImportError:
+    _json_loads = json.loads
+    _JSON_ERRORS = (json.JSONDecodeError, UnicodeDecodeError)
+
+# 기본 설정 파일 경로 (resolve() 는 import 시 한 번만)
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+_DEFAULT_CONFIG = _PROJECT_ROOT / "config" / "nvidia_racecar_config.json"
+
+
+@functools.lru_cache(maxsize=4)
+def _load_config_cached(config_path, mtime_ns):
+    # mtime_ns 는 캐시 키로만 사용 (파일이 수정되면 다시 파싱)
+    # bytes 를 그대로 파서에 넘김 (텍스트 디코딩 단계 생략)
+    try:
+        with open(config_path, 'rb') as f:
+            config = _json_loads(f.read())
+        return config
+    except _JSON_ERRORS + (IOError,) as e:
+        print(f"[jetracer] 설정 파일 읽기 오류: {e}")
+        return None
+
+
+def invalidate_config_cache():
+    """load_config 캐시를 비웁니다 (mtime 이 같은 채로 파일이 바뀐 경우 등)."""
+    _load_config_cached.cache_clear()
 
 
 def load_config(config_path=None):
     """
     차량 제어에 필요한 실제 설정 파일(JSON)을 로드합니다.
+    (path, mtime) 기준으로 캐시하므로 반환된 dict 는 수정하지 마세요.
     """
-    if config_path is None:
-        current_file = Path(__file__).resolve()
-        project_root = current_file.parent.parent.parent
-        config_path = project_root / "config" / "nvidia_racecar_config.json"
-    
-    config_path = Path(config_path)
-    if not config_path.exists():
-        return None
-    
+    config_path = str(_DEFAULT_CONFIG if config_path is None else config_path)
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        return config
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"[jetracer] 설정 파일 읽기 오류: {e}")
+        mtime_ns = os.stat(config_path).st_mtime_ns
+    except OSError:
         return None
+    
+    return _load_config_cached(config_path, mtime_ns)
 
 
 class NvidiaRacecar(Racecar):
@@ -37,6 +67,9 @@ class NvidiaRacecar(Racecar):
     """
 
     i2c_address = traitlets.Integer(default_value=0x40)
+    # busio.I2C 에 넘길 SCL 주파수 (Hz). 0 이면 ServoKit 기본 버스 사용
+    # Linux(Jetson)의 Blinka 는 이 값을 무시함 -> 버스 속도는 device tree 에서 설정 (core/README.md)
+    i2c_frequency = traitlets.Integer(default_value=0)
     steering_gain = traitlets.Float(default_value=-0.65)
     steering_offset = traitlets.Float(default_value=0.22)
     steering_channel = traitlets.Integer(default_value=0)
@@ -59,18 +92,32 @@ class NvidiaRacecar(Racecar):
     
     verbose = traitlets.Bool(default_value=False)
     
+    # True 이면 PWM 출력을 백그라운드 스레드가 PWM 프레임(1/frequency)당 한 번만 씀
+    coalesce_pwm = traitlets.Bool(default_value=False)
+    
     INPUT_TO_MS = 2.0
     
+    # verbose 모터 로그: 콜백은 deque 에 넣기만 하고 출력은 별도 스레드가 모아서 처리
+    _MOTOR_LOG_FMT = "[motor] target=%+.3f | physical_esc=%.3f\n"
+    _MOTOR_LOG_PERIOD = 0.2
+    
+    # PCA9685 LED0_ON_L 레지스터 (채널 n 은 +4n, auto-increment 로 연속 쓰기)
+    _LED0_ON_L = 0x06
+    
     def __init__(self, *args, config_path=None, **kwargs):
         """
         하드웨어를 초기화하고 설정을 적용합니다.
         """
         self._throttle_neutral = 0.12 
+        self._log_q = deque(maxlen=64)
+        self._log_thread = None
         
         config = load_config(config_path)
         if config:
             if "i2c_address" in config:
                 kwargs.setdefault("i2c_address", config["i2c_address"])
+            if "i2c_frequency" in config:
+                kwargs.setdefault("i2c_frequency", config["i2c_frequency"])
             
             if "steering" in config:
                 steering = config["steering"]
@@ -91,6 +138,9 @@ class NvidiaRacecar(Racecar):
                 kwargs.setdefault("auto_calibrate_decrement", throttle.get("auto_calibrate_decrement", -0.001))
                 self._throttle_neutral = throttle.get("neutral", 0.12)
             
+            if "coalesce_pwm" in config:
+                kwargs.setdefault("coalesce_pwm", config["coalesce_pwm"])
+            
             if "input_to_ms" in config:
                 self.INPUT_TO_MS = config["input_to_ms"]
             
@@ -99,16 +149,57 @@ class NvidiaRacecar(Racecar):
             print("[jetracer] 기본값 사용")
         
         super().__init__(*args, **kwargs)
-        self.kit = ServoKit(channels=16, address=self.i2c_address)
+        self._sync_params()
+        # batched() 블록 안에서는 채널별 최종값만 모아 두었다가 한 번에 씀
+        self._pending_pwm = None
+        # adafruit_servokit 은 board/busio 초기화까지 끌고 오므로 실제 생성 시점에 import
+        from adafruit_servokit import ServoKit
+        if self.i2c_frequency:
+            # frequency 를 지원하는 플랫폼용: 버스를 직접 만들어 넘김
+            # (Linux 의 i2c-dev 경로에서는 무시되고 커널 i2c-tegra clock-frequency 를 따름)
+            import board
+            import busio
+            i2c = busio.I2C(board.SCL, board.SDA, frequency=self.i2c_frequency)
+            self.kit = ServoKit(channels=16, i2c=i2c, address=self.i2c_address)
+        else:
+            self.kit = ServoKit(channels=16, address=self.i2c_address)
         self.kit._pca.frequency = 60
-        self.steering_motor = self.kit.continuous_servo[self.steering_channel]
-        self.throttle_motor = self.kit.continuous_servo[self.throttle_channel]
+        # 채널 번호도 콜백에서는 일반 int 로 사용 (생성 후에는 변경 불가, _check_channel)
+        self._steering_ch = int(self.steering_channel)
+        self._throttle_ch = int(self.throttle_channel)
+        self.steering_motor = self.kit.continuous_servo[self._steering_ch]
+        self.throttle_motor = self.kit.continuous_servo[self._throttle_ch]
+        
+        # 채널별 (레지스터 버퍼, min_duty, duty_range)
+        # ContinuousServo/PWMChannel 을 거치지 않고 같은 공식으로 계산한 OFF 카운트를
+        # [LEDn_ON_L, ON(2), OFF(2)] 5바이트 버퍼에 채워 I2CDevice 로 바로 씀
+        self._i2c = self.kit._pca.i2c_device
+        self._pwm_out = {}
+        for ch, motor in ((self._steering_ch, self.steering_motor),
+                          (self._throttle_ch, self.throttle_motor)):
+            buf = bytearray(5)
+            buf[0] = self._LED0_ON_L + 4 * ch
+            self._pwm_out[ch] = (buf, motor._min_duty, motor._duty_range)
+        self._pair_buf = bytearray(9)
+        # 채널별 마지막으로 내보낸 12-bit OFF 카운트 (같으면 I2C 쓰기 생략)
+        self._last_pwm_count = {}
+        
+        # coalesce_pwm: 채널별 최신값만 남겨 두고 프레임 경계에서 한 번에 씀
+        self._pwm_lock = threading.Lock()
+        self._pwm_dirty = threading.Event()
+        self._pwm_frame = {}
+        self._pwm_thread = None
+        if self.coalesce_pwm:
+            self._pwm_thread = threading.Thread(
+                target=self._pwm_loop, args=(1.0 / self.kit._pca.frequency,),
+                name="pwm-coalesce", daemon=True)
+            self._pwm_thread.start()
+            # 종료 직전의 정지 명령이 스레드와 함께 버려지지 않도록
+            atexit.register(self.flush_pwm)
         
         self.steering = 0.0
         self.throttle = 0.0
         
-        self._last_printed_steering = None
-        self._last_printed_throttle = None
         self._last_physical_throttle = self._throttle_neutral
 
     @property
@@ -118,45 +209,185 @@ class NvidiaRacecar(Racecar):
         """
         return self._last_physical_throttle
 
-    @traitlets.observe("steering")
-    def _on_steering(self, change):
+    def _sync_params(self):
+        """
+        제어 콜백에서 쓰는 traitlet 값을 일반 float 속성으로 복사합니다.
+        (traitlet 접근은 descriptor 를 거치므로 매 호출마다 읽지 않음)
+        """
+        self._steering_gain = float(self.steering_gain)
+        self._steering_offset = float(self.steering_offset)
+        self._throttle_gain = float(self.throttle_gain)
+        self._reverse_start = float(self.throttle_reverse_start)
+        self._reverse_gain = float(self.throttle_reverse_gain)
+        self._verbose = bool(self.verbose)
+        if self._verbose and self._log_thread is None:
+            self._log_thread = threading.Thread(target=self._log_loop, name="motor-log", daemon=True)
+            self._log_thread.start()
+        # 전진/후진 계수는 파라미터가 바뀔 때만 다시 계산
+        # 전진: (1.0 - 중립점) * 게인, 후진: (-1.0 - 후진시작점) * 게인 * 후진게인
+        self._forward_k = (1.0 - self._throttle_neutral) * self._throttle_gain
+        self._reverse_k = (-1.0 - self._reverse_start) * self._throttle_gain * self._reverse_gain
+
+    def _log_loop(self):
+        q = self._log_q
+        fmt = self._MOTOR_LOG_FMT
+        while True:
+            time.sleep(self._MOTOR_LOG_PERIOD)
+            if not q:
+                continue
+            lines = []
+            while q:
+                lines.append(fmt % q.popleft())
+            sys.stdout.write("".join(lines))
+            sys.stdout.flush()
+
+    @traitlets.observe("steering_gain", "steering_offset", "throttle_gain",
+                       "throttle_reverse_start", "throttle_reverse_gain", "verbose")
+    def _on_param_change(self, change):
+        self._sync_params()
+
+    @traitlets.validate("steering_channel", "throttle_channel")
+    def _check_channel(self, proposal):
+        # 채널별 레지스터 버퍼/모터 객체는 __init__ 에서 한 번만 만듦
+        name = proposal["trait"].name
+        if "_pwm_out" in self.__dict__ and proposal["value"] != getattr(self, name):
+            raise traitlets.TraitError(f"{name} 은 생성 후 변경할 수 없습니다 (config 에서 설정)")
+        return proposal["value"]
+
+    def _drive(self, channel, value):
+        """
+        value 를 채널에 출력합니다. 12-bit 출력이 이전과 같으면 쓰지 않고 False 를 반환합니다.
+        """
+        _, min_duty, duty_range = self._pwm_out[channel]
+        # 16-bit duty -> PCA9685 12-bit OFF 카운트 (PWMChannel.duty_cycle 과 동일하게 >> 4)
+        count = (min_duty + int((value + 1) / 2 * duty_range)) >> 4
+        if self._last_pwm_count.get(channel) == count:
+            return False
+        # 요청한 값으로 먼저 기록 (batched/coalesce 에서 나중 요청과 비교하기 위해)
+        # I2C 쓰기가 실패하면 _write_count/_flush_pwm 이 지워서 같은 값도 다시 쓰게 함
+        self._last_pwm_count[channel] = count
+        if self._pending_pwm is not None:
+            self._pending_pwm[channel] = count
+        elif self._pwm_thread is not None:
+            self._queue_pwm({channel: count})
+        else:
+            self._write_count(channel, count)
+        return True
+
+    def _write_count(self, channel, count):
+        buf = self._pwm_out[channel][0]
+        struct.pack_into("<HH", buf, 1, 0, count)
+        try:
+            with self._i2c as i2c:
+                i2c.write(buf)
+        except Exception:
+            # 출력되지 않은 값을 "이미 씀" 으로 남기지 않음 (정지 명령이 무시되지 않도록)
+            self._last_pwm_count.pop(channel, None)
+            raise
+
+    def _queue_pwm(self, pending):
+        with self._pwm_lock:
+            self._pwm_frame.update(pending)
+        self._pwm_dirty.set()
+
+    def flush_pwm(self):
+        """coalesce_pwm 모드에서 아직 쓰지 않은 최신값을 즉시 출력합니다."""
+        with self._pwm_lock:
+            frame, self._pwm_frame = self._pwm_frame, {}
+            self._pwm_dirty.clear()
+        if frame:
+            self._flush_pwm(frame)
+
+    def _pwm_loop(self, frame_period):
+        while True:
+            self._pwm_dirty.wait()
+            try:
+                self.flush_pwm()
+            except OSError as e:
+                # 캐시는 _flush_pwm 에서 지워졌으므로 다음 명령이 다시 씀
+                print(f"[jetracer] PWM 쓰기 실패: {e}")
+            # 같은 프레임 안의 후속 변경은 다음 쓰기로 합쳐짐
+            time.sleep(frame_period)
+
+    def _flush_pwm(self, pending):
+        """pending: {채널: 12-bit OFF 카운트}"""
+        chans = sorted(pending)
+        try:
+            if len(chans) == 2 and chans[1] - chans[0] == 1:
+                # 인접 채널 두 개는 ON/OFF 레지스터 8바이트를 한 번의 I2C 트랜잭션으로 씀
+                buf = self._pair_buf
+                struct.pack_into(
+                    "<BHHHH", buf, 0, self._LED0_ON_L + 4 * chans[0],
+                    0, pending[chans[0]],
+                    0, pending[chans[1]],
+                )
+                with self._i2c as i2c:
+                    i2c.write(buf)
+            else:
+                for ch, count in pending.items():
+                    self._write_count(ch, count)
+        except Exception:
+            for ch in chans:
+                self._last_pwm_count.pop(ch, None)
+            raise
+
+    @contextmanager
+    def batched(self):
+        """
+        블록 안의 steering/throttle 변경을 모아 종료 시 한 번에 PCA9685 에 씁니다.
+        같은 채널에 여러 번 대입해도 마지막 값만 출력됩니다.
+        """
+        if self._pending_pwm is not None:
+            yield self
+            return
+        self._pending_pwm = {}
+        try:
+            yield self
+        finally:
+            pending, self._pending_pwm = self._pending_pwm, None
+            if pending:
+                if self._pwm_thread is not None:
+                    self._queue_pwm(pending)
+                else:
+                    self._flush_pwm(pending)
+
+    def set_commands(self, steering, throttle):
+        """steering/throttle 을 함께 갱신합니다 (I2C 쓰기 1회)."""
+        with self.batched():
+            self.steering = steering
+            self.throttle = throttle
+
+    def _on_steering(self, input_val):
         """
         스티어링 제어: 중앙점 + (입력 * 게인)
         """
-        final_steering = self.steering_offset + (change["new"] * self.steering_gain)
-        final_steering = max(-1.0, min(1.0, final_steering))
-        self.steering_motor.throttle = final_steering
+        final_steering = self._steering_offset + (input_val * self._steering_gain)
+        if not _CLIP_LO <= final_steering <= _CLIP_HI:
+            final_steering = _CLIP_LO if final_steering < _CLIP_LO else _CLIP_HI
+        self._drive(self._steering_ch, final_steering)
 
-    @traitlets.observe("throttle")
-    def _on_throttle(self, change):
+    def _on_throttle(self, input_val):
         """
         스로틀 제어: 
         - 전진(>0): 중립점 + 입력 * (최대1.0 - 중립점) * 게인
         - 후진(<0): 후진시작점 + 입력 * (최소-1.0 - 후진시작점) * 게인
         - 정지(=0): 중립점
         """
-        input_val = change["new"]
-        
         if abs(input_val) < 0.01:
             # 1. 정지 (Neutral)
             final_throttle = self._throttle_neutral
         elif input_val > 0:
             # 2. 전진
-            range_fwd = (1.0 - self._throttle_neutral)
-            final_throttle = self._throttle_neutral + (input_val * range_fwd * self.throttle_gain)
+            final_throttle = self._throttle_neutral + input_val * self._forward_k
         else:
             # 3. 후진 (reverse_gain 적용)
-            range_rev = (-1.0 - self.throttle_reverse_start)
-            final_throttle = self.throttle_reverse_start + (abs(input_val) * range_rev * self.throttle_gain * self.throttle_reverse_gain)
+            final_throttle = self._reverse_start + abs(input_val) * self._reverse_k
         
         # 물리적 한계 클리핑
-        final_throttle = max(-1.0, min(1.0, final_throttle))
+        if not _CLIP_LO <= final_throttle <= _CLIP_HI:
+            final_throttle = _CLIP_LO if final_throttle < _CLIP_LO else _CLIP_HI
         self._last_physical_throttle = final_throttle
         
-        # 캘리브레이션용 로그 출력
-        rounded_phys = round(final_throttle, 3)
-        if getattr(self, "verbose", False) and rounded_phys != self._last_printed_throttle:
-            print(f"[motor] target={input_val:+.3f} | physical_esc={final_throttle:.3f}")
-            self._last_printed_throttle = rounded_phys
-            
-        self.throttle_motor.throttle = final_throttle
+        # 출력(12-bit)이 실제로 바뀐 경우에만 캘리브레이션용 로그 출력
+        if self._drive(self._throttle_ch, final_throttle) and self._verbose:
+            self._log_q.append((input_val, final_throttle))
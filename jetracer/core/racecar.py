@@ -1,27 +1,54 @@
 import traitlets
 
+# 클리핑 범위. max(lo, min(hi, x)) 는 builtin 호출 2번이라
+# 범위 안의 값(대부분의 경우)은 체인 비교 한 번으로 통과시킴
+_CLIP_LO = -1.0
+_CLIP_HI = 1.0
+
 
 class Racecar(traitlets.HasTraits):
-    """스티어 및 스로틀 값을 traitlets 로 관리하는 기본 차량 모델."""
-
-    steering = traitlets.Float()
-    throttle = traitlets.Float()
-
-    @traitlets.validate("steering")
-    def _clip_steering(self, proposal):
-        value = proposal["value"]
-        if value > 1.0:
-            return 1.0
-        if value < -1.0:
-            return -1.0
-        return value
-
-    @traitlets.validate("throttle")
-    def _clip_throttle(self, proposal):
-        value = proposal["value"]
-        if value > 1.0:
-            return 1.0
-        if value < -1.0:
-            return -1.0
-        return value
+    """
+    스티어 및 스로틀 값을 관리하는 기본 차량 모델.
+
+    steering/throttle 은 제어 루프마다 대입되므로 traitlets 대신 property 로 처리합니다.
+    -1.0~1.0 으로 클리핑하고, 값이 바뀔 때만 _on_steering/_on_throttle 을 호출합니다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._steering = 0.0
+        self._throttle = 0.0
+        super().__init__(*args, **kwargs)
+
+    @property
+    def steering(self):
+        return self._steering
+
+    @steering.setter
+    def steering(self, value):
+        value = float(value)
+        if not _CLIP_LO <= value <= _CLIP_HI:
+            value = _CLIP_LO if value < _CLIP_LO else _CLIP_HI
+        if value == self._steering:
+            return
+        self._steering = value
+        self._on_steering(value)
+
+    @property
+    def throttle(self):
+        return self._throttle
+
+    @throttle.setter
+    def throttle(self, value):
+        value = float(value)
+        if not _CLIP_LO <= value <= _CLIP_HI:
+            value = _CLIP_LO if value < _CLIP_LO else _CLIP_HI
+        if value == self._throttle:
+            return
+        self._throttle = value
+        self._on_throttle(value)
+
+    def _on_steering(self, value):
+        """하위 클래스에서 실제 출력을 구현합니다."""
 
+    def _on_throttle(self, value):
+        """하위 클래스에서 실제 출력을 구현합니다."""
@@ -2,128 +2,240 @@
 # JetRacer AI Kit (2S2P, 8.4V full) Battery Monitor
 # INA219 @0x42  +  SSD1306 128x32 @0x3C
 
+import errno
+import fcntl
+import os
 import re
 import socket
+import struct
 import subprocess
 import time
 
-import Adafruit_SSD1306
-import board
-import busio
-from PIL import Image, ImageDraw, ImageFont
-from adafruit_ina219 import INA219
+# SOC(2S, per-cell 테이블 보간)는 텔레메트리 쪽과 같은 구현을 사용
+from jetracer.teleop.telemetry_common import soc_from_voltage
 
-# ---------- OLED ----------
-disp = Adafruit_SSD1306.SSD1306_128_32(rst=None, i2c_bus=1, gpio=1)
-disp.begin()
-disp.clear()
-disp.display()
+# 하드웨어(OLED/INA219) 객체는 main() 에서 생성 (import 만으로 I2C 를 건드리지 않음)
+disp = image = draw = font = None
+static_image = static_draw = None
+ina = None
 
-width, height = disp.width, disp.height
-image = Image.new("1", (width, height))
-draw = ImageDraw.Draw(image)
-font = ImageFont.load_default()
+# WiFi/IP 줄은 값이 바뀔 때만 다시 그려 두고 매 프레임 붙여넣기
+_static_key = None
 
-# ---------- INA219 ----------
-i2c = busio.I2C(board.SCL, board.SDA)
-ina = INA219(i2c, addr=0x42)
+# 마지막으로 OLED 에 보낸 화면 내용 (같으면 I2C 전송 생략)
+_last_oled = None
 
-# ---------- SOC (2S, per-cell 테이블 보간) ----------
-SOC_TABLE = [(4.20, 100), (4.00, 85), (3.85, 60), (3.70, 40), (3.50, 20), (3.30, 10), (3.00, 0)]
 
+def init_hardware():
+    global disp, image, draw, font, static_image, static_draw, ina
+    import Adafruit_SSD1306
+    import board
+    import busio
+    from PIL import Image, ImageDraw, ImageFont
+    from adafruit_ina219 import INA219
 
-def soc_from_voltage(pack_v, cells=2):
-    vpc = pack_v / cells
-    if vpc >= 4.20:
-        return 100
-    if vpc <= 3.00:
-        return 0
-    for (vh, sh), (vl, sl) in zip(SOC_TABLE, SOC_TABLE[1:]):
-        if vl <= vpc <= vh:
-            t = (vpc - vl) / (vh - vl)
-            return int(sl + t * (sh - sl))
-    return 0
+    # ---------- OLED ----------
+    disp = Adafruit_SSD1306.SSD1306_128_32(rst=None, i2c_bus=1, gpio=1)
+    disp.begin()
+    disp.clear()
+    disp.display()
+
+    image = Image.new("1", (disp.width, disp.height))
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default()
+
+    static_image = Image.new("1", (disp.width, disp.height))
+    static_draw = ImageDraw.Draw(static_image)
+
+    # ---------- INA219 ----------
+    i2c = busio.I2C(board.SCL, board.SDA)
+    ina = INA219(i2c, addr=0x42)
 
 
 # ---------- 네트워크 (선택 표시) ----------
+_IP_RE = re.compile(r"inet\s+(\d+\.\d+\.\d+\.\d+)")
+
+# SSID/IP 는 거의 바뀌지 않으므로 NET_CACHE_TTL 동안 재사용 (매 2초 subprocess 방지)
+NET_CACHE_TTL = 30.0
+# 조회 자체가 실패했을 때(예외)는 이전 값을 유지하고 이 간격으로 다시 시도
+NET_RETRY_TTL = 4.0
+_net_cache = {}
+
+
+def _cached(key, fn):
+    now = time.monotonic()
+    hit = _net_cache.get(key)
+    if hit is not None and now < hit[0]:
+        return hit[1]
+    try:
+        value = fn()
+        ttl = NET_CACHE_TTL
+    except Exception:
+        value = hit[1] if hit is not None else None
+        ttl = NET_RETRY_TTL
+    _net_cache[key] = (now + ttl, value)
+    return value
+
+
 def _run(cmd):
     return subprocess.check_output(cmd, text=True).strip()
 
 
 def get_wifi_ssid():
+    """
+    연결된 SSID, 연결되어 있지 않으면 None.
+    nmcli/iwgetid 모두 실행하지 못하면 RuntimeError (_cached 가 이전 값을 유지).
+    """
+    answered = False
     try:
         out = _run(["/usr/bin/nmcli", "-t", "-f", "ACTIVE,SSID", "dev", "wifi"])
+        answered = True
         for line in out.splitlines():
             if line.startswith("yes:"):
                 return line.split(":", 1)[1] or None
-    except Exception:
+    except (OSError, subprocess.CalledProcessError):
         pass
     for path in ("/usr/sbin/iwgetid", "/sbin/iwgetid"):
         try:
             s = _run([path, "-r"])
-            if s:
-                return s
-        except Exception:
-            pass
+        except OSError:
+            continue
+        except subprocess.CalledProcessError:
+            # iwgetid 는 연결이 없으면 0 이 아닌 코드로 종료
+            answered = True
+            continue
+        answered = True
+        if s:
+            return s
+    if not answered:
+        raise RuntimeError("SSID lookup failed (nmcli/iwgetid unavailable)")
     return None
 
 
+SIOCGIFADDR = 0x8915
+
+
+def _ip_via_ioctl(iface):
+    # fork/exec 없이 커널에 직접 IPv4 주소 조회 (주소가 없으면 OSError)
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        ifreq = struct.pack("256s", iface.encode()[:15])
+        return socket.inet_ntoa(fcntl.ioctl(s.fileno(), SIOCGIFADDR, ifreq)[20:24])
+    finally:
+        s.close()
+
+
 def _ip_from_iface(iface):
+    """인터페이스의 IPv4 주소, 없으면 None. ioctl/ip 명령 모두 실패하면 OSError."""
+    try:
+        return _ip_via_ioctl(iface)
+    except OSError as e:
+        # 인터페이스 없음 / IPv4 주소 없음은 확정된 결과 → ip 명령으로 다시 확인하지 않음
+        if e.errno in (errno.ENODEV, errno.EADDRNOTAVAIL):
+            return None
+        err = e
     for ipbin in ("/usr/sbin/ip", "/sbin/ip", "/usr/bin/ip"):
         try:
             out = _run([ipbin, "-4", "addr", "show", iface])
-            m = re.search(r"inet\s+(\d+\.\d+\.\d+\.\d+)", out)
-            if m:
-                return m.group(1)
-        except Exception:
-            pass
-    return None
+        except OSError:
+            continue
+        except subprocess.CalledProcessError:
+            return None
+        m = _IP_RE.search(out)
+        return m.group(1) if m else None
+    raise err
 
 
 def get_ip():
+    """
+    IPv4 주소, 네트워크가 없으면 None.
+    인터페이스 조회가 실패했고 기본 경로로도 확인하지 못하면 OSError.
+    """
+    err = None
     for iface in ("wlan0", "wlp1s0", "wlp2s0", "eth0"):
-        ip = _ip_from_iface(iface)
+        try:
+            ip = _ip_from_iface(iface)
+        except OSError as e:
+            err = e
+            continue
         if ip:
             return ip
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         s.settimeout(0.2)
         s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
+        return s.getsockname()[0]
+    except OSError:
+        # 기본 경로 없음(ENETUNREACH 등)은 미연결
+        pass
+    finally:
         s.close()
-        return ip
-    except Exception:
-        return None
+    if err is not None:
+        raise err
+    return None
 
 
 def draw_oled(pct, vpack, ssid, ip):
-    draw.rectangle((0, 0, width, height), outline=0, fill=0)
-    draw.text((0, 0), f"Bat:{pct:3d}% ({vpack:4.2f}V)", font=font, fill=255)
-    draw.text((0, 12), f"WiFi:{ssid or 'OFF'}", font=font, fill=255)
-    draw.text((0, 22), f"IP:{ip or '-'}", font=font, fill=255)
+    global _static_key, _last_oled
+    bat_line = f"Bat:{pct:3d}% ({vpack:4.2f}V)"
+    sig = (bat_line, ssid, ip)
+    if sig == _last_oled:
+        return
+    _last_oled = sig
+
+    if (ssid, ip) != _static_key:
+        static_draw.rectangle((0, 0, disp.width, disp.height), outline=0, fill=0)
+        static_draw.text((0, 12), f"WiFi:{ssid or 'OFF'}", font=font, fill=255)
+        static_draw.text((0, 22), f"IP:{ip or '-'}", font=font, fill=255)
+        _static_key = (ssid, ip)
+
+    image.paste(static_image)
+    draw.text((0, 0), bat_line, font=font, fill=255)
     disp.image(image)
     disp.display()
 
 
-try:
-    while True:
-        vpack = ina.bus_voltage + (ina.shunt_voltage / 1000.0)
-        pct = soc_from_voltage(vpack, cells=2)
-        ssid = get_wifi_ssid()
-        ip = get_ip()
-        print(f"Battery={pct}% ({vpack:.2f}V) | WiFi={ssid or 'OFF'} | IP={ip or '-'}")
-        
-        # 다른 프로세스(Racecar)가 읽을 수 있도록 전압을 파일(RAM Disk)에 기록
-        try:
-            with open("/dev/shm/jetracer_voltage", "w") as f:
-                f.write(f"{vpack:.4f}")
-        except Exception:
-            pass
-
-        draw_oled(pct, vpack, ssid, ip)
-        time.sleep(2)
-except KeyboardInterrupt:
-    disp.clear()
-    disp.display()
+VOLTAGE_SHM = "/dev/shm/jetracer_voltage"
+
 
+def write_voltage(fd, vpack):
+    # 먼저 덮어쓰고 길이를 맞춰 자름 (O_TRUNC 후 쓰기와 달리 읽는 쪽이 빈 파일을 보지 않음)
+    data = f"{vpack:.4f}".encode()
+    os.pwrite(fd, data, 0)
+    os.ftruncate(fd, len(data))
 
+
+def main():
+    init_hardware()
+    # 전압 파일은 한 번만 열어 두고 매 주기 pwrite (open/close 반복 없음)
+    try:
+        vfd = os.open(VOLTAGE_SHM, os.O_WRONLY | os.O_CREAT, 0o644)
+    except OSError:
+        vfd = None
+    try:
+        while True:
+            vpack = ina.bus_voltage + (ina.shunt_voltage / 1000.0)
+            pct = soc_from_voltage(vpack, cells=2)
+            ssid = _cached("ssid", get_wifi_ssid)
+            ip = _cached("ip", get_ip)
+            print(f"Battery={pct}% ({vpack:.2f}V) | WiFi={ssid or 'OFF'} | IP={ip or '-'}")
+        
+            # 다른 프로세스(Racecar)가 읽을 수 있도록 전압을 파일(RAM Disk)에 기록
+            if vfd is not None:
+                try:
+                    write_voltage(vfd, vpack)
+                except OSError:
+                    pass
+
+            draw_oled(pct, vpack, ssid, ip)
+            time.sleep(2)
+    except KeyboardInterrupt:
+        disp.clear()
+        disp.display()
+    finally:
+        if vfd is not None:
+            os.close(vfd)
+
+
+if __name__ == "__main__":
+    main()
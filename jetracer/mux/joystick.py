@@ -1,6 +1,7 @@
 import argparse
 import time
 import json
+import math
 import socket
 import threading
 from evdev import InputDevice, ecodes, list_devices
@@ -27,6 +28,21 @@ STEER_GAIN_DOWN_BTN = ecodes.BTN_TL2  # LT (L2) Digital
 STEER_GAIN_UP_AXIS   = ecodes.ABS_RZ   # RT (R2) Analog
 STEER_GAIN_DOWN_AXIS = ecodes.ABS_Z    # LT (L2) Analog
 
+# ======================
+# 송신 메시지 (미리 인코딩)
+# ======================
+# 제어 메시지는 매 주기 전송되므로 dict + json.dumps 대신 bytes 템플릿에 값만 채움
+CTRL_TPL = b'{"src": "joystick", "steer": %.3f, "throttle": %.3f}'
+
+EVENT_MSGS = {
+    name: json.dumps({"src": "joystick", "event": name}).encode()
+    for name in ("toggle", "estop", "speed5_up", "speed5_down", "steer_gain_up", "steer_gain_down")
+}
+
+# 값이 그대로면 제어 메시지를 생략하되, 이 주기로는 다시 보냄
+# (MUX 의 JOY_TIMEOUT=0.5s 보다 짧아야 조이스틱 입력이 끊긴 것으로 처리되지 않음)
+CTRL_HEARTBEAT = 0.25
+
 
 def clamp(x, lo=-1.0, hi=1.0):
     """
@@ -38,8 +54,10 @@ def clamp(x, lo=-1.0, hi=1.0):
 def apply_deadzone(v, dz):
     """
     입력 신호에 데드존을 적용하여 미세한 노이즈를 제거합니다.
+    데드존 밖은 0~1 로 다시 스케일하므로 경계에서 값이 튀지 않습니다.
     """
-    return 0.0 if abs(v) < dz else v
+    a = abs(v) - dz
+    return 0.0 if a <= 0.0 else math.copysign(a / (1.0 - dz), v)
 
 
 def norm_axis(val, lo, hi):
@@ -97,6 +115,9 @@ def run_joystick(log_queue, stop_event, device=None, deadzone=0.08, steer_scale=
     # 상태 변수 초기화
     steer_cmd = 0.0
     throttle_cmd = 0.0
+    # 축 원시값 (-32768..32767). 이벤트마다 계산하지 않고 배치 끝에서 한 번 변환
+    steer_raw = 0
+    thr_raw = 0
     current_max_throttle = max_throttle
 
     last_toggle = 0
@@ -118,17 +139,20 @@ def run_joystick(log_queue, stop_event, device=None, deadzone=0.08, steer_scale=
         """
         일정한 주기로 MUX에 최신 제어 명령을 전송합니다.
         """
+        last_payload = None
+        last_tx = 0.0
         while running and not stop_event.is_set():
             with lock:
-                msg = {
-                    "src": "joystick",
-                    "steer": steer_cmd,
-                    "throttle": throttle_cmd
-                }
-            try:
-                udsock.sendto(json.dumps(msg).encode(), SOCK_PATH)
-            except OSError:
-                break
+                payload = CTRL_TPL % (steer_cmd, throttle_cmd)
+            # %.3f 로 포맷된 결과가 같으면 변화량 1e-3 미만 -> heartbeat 때만 전송
+            now_tx = time.monotonic()
+            if payload != last_payload or now_tx - last_tx >= CTRL_HEARTBEAT:
+                try:
+                    udsock.sendto(payload, SOCK_PATH)
+                except OSError:
+                    break
+                last_payload = payload
+                last_tx = now_tx
             time.sleep(period)
 
     t = threading.Thread(target=sender_loop, daemon=True)
@@ -148,6 +172,7 @@ def run_joystick(log_queue, stop_event, device=None, deadzone=0.08, steer_scale=
                 time.sleep(0.01)
                 continue
 
+            dirty = False
             for event in events:
                 with lock:
                     # ---------- 버튼 처리 ----------
@@ -155,94 +180,80 @@ def run_joystick(log_queue, stop_event, device=None, deadzone=0.08, steer_scale=
                         if event.code == TOGGLE_BTN:
                             now_btn = time.time()
                             if event.value == 1 and last_toggle == 0 and (now_btn - last_toggle_time) > TOGGLE_DEBOUNCE:
-                                udsock.sendto(
-                                    json.dumps({"src": "joystick", "event": "toggle"}).encode(),
-                                    SOCK_PATH
-                                )
+                                udsock.sendto(EVENT_MSGS["toggle"], SOCK_PATH)
                                 log_queue.put({"type": "LOG", "src": "JOY", "msg": "[BTN] mode toggle"})
                                 last_toggle_time = now_btn
                             last_toggle = event.value
 
                         elif event.code == STOP_BTN:
                             if event.value == 1 and last_stop == 0:
-                                udsock.sendto(
-                                    json.dumps({"src": "joystick", "event": "estop"}).encode(),
-                                    SOCK_PATH
-                                )
+                                udsock.sendto(EVENT_MSGS["estop"], SOCK_PATH)
                                 log_queue.put({"type": "LOG", "src": "JOY", "msg": "[BTN] EMERGENCY STOP"})
                             last_stop = event.value
 
                         elif event.code == THR_UP_BTN:
                             if event.value == 1 and last_thr_up == 0:
-                                udsock.sendto(
-                                    json.dumps({"src": "joystick", "event": "speed5_up"}).encode(),
-                                    SOCK_PATH
-                                )
+                                udsock.sendto(EVENT_MSGS["speed5_up"], SOCK_PATH)
                                 log_queue.put({"type": "LOG", "src": "JOY", "msg": "[BTN] SPEED5 +0.01"})
                             last_thr_up = event.value
 
                         elif event.code == THR_DOWN_BTN:
                             if event.value == 1 and last_thr_dn == 0:
-                                udsock.sendto(
-                                    json.dumps({"src": "joystick", "event": "speed5_down"}).encode(),
-                                    SOCK_PATH
-                                )
+                                udsock.sendto(EVENT_MSGS["speed5_down"], SOCK_PATH)
                                 log_queue.put({"type": "LOG", "src": "JOY", "msg": "[BTN] SPEED5 -0.01"})
                             last_thr_dn = event.value
 
                         elif event.code == STEER_GAIN_UP_BTN:
                             if event.value == 1 and last_ga_up == 0:
-                                udsock.sendto(
-                                    json.dumps({"src": "joystick", "event": "steer_gain_up"}).encode(),
-                                    SOCK_PATH
-                                )
+                                udsock.sendto(EVENT_MSGS["steer_gain_up"], SOCK_PATH)
                                 log_queue.put({"type": "LOG", "src": "JOY", "msg": "[BTN] STEER GAIN UP (Digital)"})
                             last_ga_up = event.value
 
                         elif event.code == STEER_GAIN_DOWN_BTN:
                             if event.value == 1 and last_ga_dn == 0:
-                                udsock.sendto(
-                                    json.dumps({"src": "joystick", "event": "steer_gain_down"}).encode(),
-                                    SOCK_PATH
-                                )
+                                udsock.sendto(EVENT_MSGS["steer_gain_down"], SOCK_PATH)
                                 log_queue.put({"type": "LOG", "src": "JOY", "msg": "[BTN] STEER GAIN DOWN (Digital)"})
                             last_ga_dn = event.value
 
                     # ---------- 축(Analog Stick) 처리 ----------
                     elif event.type == ecodes.EV_ABS:
                         if event.code == STEER_AXIS:
-                            raw_norm = norm_axis(event.value, -32768, 32767)
-                            val = apply_deadzone(raw_norm, deadzone)
-                            if invert_steer: val = -val
-                            steer_cmd = clamp(val * steer_scale)
+                            steer_raw = event.value
+                            dirty = True
 
                         elif event.code == THROTTLE_AXIS:
-                            raw_norm = norm_axis(event.value, -32768, 32767)
-                            val = apply_deadzone(raw_norm, deadzone)
-                            if invert_throttle: val = -val
-                            throttle_cmd = clamp(val)
+                            thr_raw = event.value
+                            dirty = True
 
                         # LT/RT 트리거를 아날로그 축으로 감지할 때 (0~255)
                         elif event.code == STEER_GAIN_UP_AXIS:
                             is_pressed = event.value > 128
                             if is_pressed and last_ga_up == 0:
-                                udsock.sendto(
-                                    json.dumps({"src": "joystick", "event": "steer_gain_up"}).encode(),
-                                    SOCK_PATH
-                                )
+                                udsock.sendto(EVENT_MSGS["steer_gain_up"], SOCK_PATH)
                                 log_queue.put({"type": "LOG", "src": "JOY", "msg": "[AXIS] STEER GAIN UP (Analog)"})
                             last_ga_up = 1 if is_pressed else 0
 
                         elif event.code == STEER_GAIN_DOWN_AXIS:
                             is_pressed = event.value > 128
                             if is_pressed and last_ga_dn == 0:
-                                udsock.sendto(
-                                    json.dumps({"src": "joystick", "event": "steer_gain_down"}).encode(),
-                                    SOCK_PATH
-                                )
+                                udsock.sendto(EVENT_MSGS["steer_gain_down"], SOCK_PATH)
                                 log_queue.put({"type": "LOG", "src": "JOY", "msg": "[AXIS] STEER GAIN DOWN (Analog)"})
                             last_ga_dn = 1 if is_pressed else 0
 
+            # ---------- 제어값 갱신 (축이 바뀐 배치에서만) ----------
+            if dirty:
+                val = apply_deadzone(norm_axis(steer_raw, -32768, 32767), deadzone)
+                if invert_steer: val = -val
+                new_steer = clamp(val * steer_scale)
+
+                val = apply_deadzone(norm_axis(thr_raw, -32768, 32767), deadzone)
+                if invert_throttle: val = -val
+                new_throttle = clamp(val)
+
+                with lock:
+                    steer_cmd = new_steer
+                    throttle_cmd = new_throttle
+
     except KeyboardInterrupt:
         pass
     except Exception as e:
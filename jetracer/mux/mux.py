@@ -9,7 +9,7 @@ from datetime import datetime
 from collections import deque
 
 from jetracer.core import NvidiaRacecar
-from jetracer.teleop.telemetry_common import read_voltage, read_battery_pct
+from jetracer.teleop.telemetry_common import VoltageSampler, read_battery_pct
 
 
 # =========================
@@ -107,6 +107,10 @@ def run_mux(log_queue, stop_event, speed5_throttle, log_calibration=False, verbo
     # 배터리 스무딩 설정 (노이즈 방지)
     soc_window = deque(maxlen=30)  # 약 1초 간의 배터리 잔량 평균 (30Hz 기준)
 
+    # CSV 행마다 파일을 읽지 않도록 전압은 백그라운드 스레드에서 갱신
+    # (전압은 캘리브레이션 로그에만 쓰이므로 로깅할 때만 시작)
+    voltage = VoltageSampler().start() if log_calibration else None
+
     def open_calibration_log(pct_val):
         nonlocal csv_file, csv_writer
         if csv_file:
@@ -157,7 +161,7 @@ def run_mux(log_queue, stop_event, speed5_throttle, log_calibration=False, verbo
             while True:
                 try:
                     data, _ = sock.recvfrom(512)
-                    msg = json.loads(data.decode())
+                    msg = json.loads(data)
                     src = msg.get("src")
                     event = msg.get("event")
 
@@ -188,7 +192,7 @@ def run_mux(log_queue, stop_event, speed5_throttle, log_calibration=False, verbo
                                 cur_inc = msg.get("inc", 0.0)
                                 cur_dec = msg.get("dec", 0.0)
                                 # timestamp, type, value, direction, obs_value, cmd_speed, threshold, reason, lost_packets, inc, dec, battery
-                                csv_writer.writerow([time.time(), "auto_adjust", SPEED_5_PHYS, cv_dir, "", "", thr, reason, 0, cur_inc, cur_dec, read_voltage()])
+                                csv_writer.writerow([time.time(), "auto_adjust", SPEED_5_PHYS, cv_dir, "", "", thr, reason, 0, cur_inc, cur_dec, voltage.value])
 
                     elif event == "speed5_up":
                         step = 0.01 if mode == "joystick" else 0.001
@@ -196,7 +200,7 @@ def run_mux(log_queue, stop_event, speed5_throttle, log_calibration=False, verbo
                         SPEED_1_PHYS = SPEED_5_PHYS - 0.01
                         log_queue.put({"type": "LOG", "src": "MUX", "msg": f"SPEED_5_PHYS → {SPEED_5_PHYS:.3f} (+{step})"})
                         if csv_writer:
-                            csv_writer.writerow([time.time(), "adjust", SPEED_5_PHYS, "+", "", "", "", "", 0, 0, 0, read_voltage()])
+                            csv_writer.writerow([time.time(), "adjust", SPEED_5_PHYS, "+", "", "", "", "", 0, 0, 0, voltage.value])
 
                     elif event == "speed5_down":
                         step = 0.01 if mode == "joystick" else 0.001
@@ -204,7 +208,7 @@ def run_mux(log_queue, stop_event, speed5_throttle, log_calibration=False, verbo
                         SPEED_1_PHYS = SPEED_5_PHYS - 0.01
                         log_queue.put({"type": "LOG", "src": "MUX", "msg": f"SPEED_5_PHYS → {SPEED_5_PHYS:.3f} (-{step})"})
                         if csv_writer:
-                            csv_writer.writerow([time.time(), "adjust", SPEED_5_PHYS, "-", "", "", "", "", 0, 0, 0, read_voltage()])
+                            csv_writer.writerow([time.time(), "adjust", SPEED_5_PHYS, "-", "", "", "", "", 0, 0, 0, voltage.value])
 
                     elif event == "steer_gain_up":
                         step = 0.001
@@ -248,7 +252,7 @@ def run_mux(log_queue, stop_event, speed5_throttle, log_calibration=False, verbo
                                     cur_dec = msg.get("dec", 0.0)
                                     # timestamp, type, value, direction, obs_value, cmd_speed, threshold, reason, lost_packets, inc, dec, battery
                                     # value 컬럼에 현재 튜닝 대상인 SPEED_5_PHYS 기록
-                                    csv_writer.writerow([time.time(), "speed", SPEED_5_PHYS, "", obs_sp, cmd_sp, thr, "", lost, cur_inc, cur_dec, read_voltage()])
+                                    csv_writer.writerow([time.time(), "speed", SPEED_5_PHYS, "", obs_sp, cmd_sp, thr, "", lost, cur_inc, cur_dec, voltage.value])
 
                 except BlockingIOError:
                     break
@@ -259,8 +263,7 @@ def run_mux(log_queue, stop_event, speed5_throttle, log_calibration=False, verbo
             now = time.time()
 
             if estop:
-                car.steering = 0.0
-                car.throttle = 0.0
+                car.set_commands(0.0, 0.0)
                 time.sleep(0.01)
                 continue
 
@@ -274,53 +277,55 @@ def run_mux(log_queue, stop_event, speed5_throttle, log_calibration=False, verbo
                 cmd = last_joy
                 src_used = "JOY"
 
-            if cmd and "steer" in cmd:
-                car.steering = cmd["steer"]
+            # 한 틱 안의 steering/throttle 대입(보정 포함)은 종료 시 I2C 한 번으로 출력
+            with car.batched():
+                if cmd and "steer" in cmd:
+                    car.steering = cmd["steer"]
                 
-                if "speed" in cmd:
-                    # 새로운 NvidiaRacecar 공식에 맞춘 정교한 역산 적용
-                    car.throttle = speed_to_normalized_throttle(
-                        cmd["speed"],
-                        SPEED_1_PHYS,
-                        SPEED_5_PHYS,
-                        ESC_NEUTRAL,
-                        THR_GAIN
-                    )
-                else:
-                    # 조이스틱 입력 (-1.0 ~ 1.0) 처리
-                    # 조이스틱의 1.0(최대)이 SPEED_5_PHYS에 도달하도록 스케일링
-                    # speed_to_normalized_throttle 함수는 0~5 범위를 받으므로 
-                    # 조이스틱 입력을 0~5 범위로 매핑하여 재활용
-                    joy_throttle = cmd["throttle"]
-                    if joy_throttle > 0:
-                        # 0.0~1.0 조이스틱 입력을 0.0~5.0 속도로 변환하여 동일한 물리 타겟팅 적용
-                        virtual_speed = joy_throttle * 5.0
+                    if "speed" in cmd:
+                        # 새로운 NvidiaRacecar 공식에 맞춘 정교한 역산 적용
                         car.throttle = speed_to_normalized_throttle(
-                            virtual_speed,
+                            cmd["speed"],
                             SPEED_1_PHYS,
                             SPEED_5_PHYS,
                             ESC_NEUTRAL,
                             THR_GAIN
                         )
                     else:
-                        # 후진은 NvidiaRacecar의 내부 공식(REVERSE_START base)을 따릅니다.
-                        car.throttle = joy_throttle
+                        # 조이스틱 입력 (-1.0 ~ 1.0) 처리
+                        # 조이스틱의 1.0(최대)이 SPEED_5_PHYS에 도달하도록 스케일링
+                        # speed_to_normalized_throttle 함수는 0~5 범위를 받으므로 
+                        # 조이스틱 입력을 0~5 범위로 매핑하여 재활용
+                        joy_throttle = cmd["throttle"]
+                        if joy_throttle > 0:
+                            # 0.0~1.0 조이스틱 입력을 0.0~5.0 속도로 변환하여 동일한 물리 타겟팅 적용
+                            virtual_speed = joy_throttle * 5.0
+                            car.throttle = speed_to_normalized_throttle(
+                                virtual_speed,
+                                SPEED_1_PHYS,
+                                SPEED_5_PHYS,
+                                ESC_NEUTRAL,
+                                THR_GAIN
+                            )
+                        else:
+                            # 후진은 NvidiaRacecar의 내부 공식(REVERSE_START base)을 따릅니다.
+                            car.throttle = joy_throttle
                 
-                # 조향 시 감속 방지를 위한 보정 게인 적용 (좌/우 개별 적용)
-                if abs(car.steering) > 0.1 and abs(car.throttle) > 0.01:
-                    # 좌조향(steering < 0), 우조향(steering > 0)에 맞춰 게인 선택
-                    gain = steer_thr_gain_left if car.steering < 0 else steer_thr_gain_right
-                    compensation = abs(car.steering) * gain
+                    # 조향 시 감속 방지를 위한 보정 게인 적용 (좌/우 개별 적용)
+                    if abs(car.steering) > 0.1 and abs(car.throttle) > 0.01:
+                        # 좌조향(steering < 0), 우조향(steering > 0)에 맞춰 게인 선택
+                        gain = steer_thr_gain_left if car.steering < 0 else steer_thr_gain_right
+                        compensation = abs(car.steering) * gain
                     
-                    if car.throttle > 0:
-                        car.throttle = min(1.0, car.throttle + compensation)
-                    else:
-                        car.throttle = max(-1.0, car.throttle - compensation)
+                        if car.throttle > 0:
+                            car.throttle = min(1.0, car.throttle + compensation)
+                        else:
+                            car.throttle = max(-1.0, car.throttle - compensation)
                 
-            else:
-                car.steering = 0.0
-                car.throttle = 0.0
-                src_used = "IDLE"
+                else:
+                    car.steering = 0.0
+                    car.throttle = 0.0
+                    src_used = "IDLE"
 
             # 0.5초 주기로 제어 상태 로그 출력
             if now - last_log_time > 0.5:
@@ -344,6 +349,8 @@ def run_mux(log_queue, stop_event, speed5_throttle, log_calibration=False, verbo
         car.steering = 0.0
         car.throttle = 0.0
         sock.close()
+        if voltage:
+            voltage.stop()
         if csv_file:
             csv_file.close()
         if os.path.exists(SOCK_PATH):
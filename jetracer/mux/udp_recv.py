@@ -34,6 +34,37 @@ def clamp(n, minn, maxn):
     return max(min(maxn, n), minn)
 
 
+class RingMean:
+    """
+    고정 길이 이동 평균. 누적합을 갱신하므로 append/mean 모두 O(1) 입니다.
+    (한 바퀴마다 합을 다시 계산해 부동소수 오차 누적 방지)
+    """
+
+    def __init__(self, size):
+        self._buf = [0.0] * size
+        self._size = size
+        self._idx = 0
+        self._count = 0
+        self._sum = 0.0
+
+    def append(self, x):
+        x = float(x)
+        self._sum += x - self._buf[self._idx]
+        self._buf[self._idx] = x
+        self._idx += 1
+        if self._idx == self._size:
+            self._idx = 0
+            self._sum = sum(self._buf)
+        if self._count < self._size:
+            self._count += 1
+
+    def __len__(self):
+        return self._count
+
+    def mean(self):
+        return self._sum / self._count if self._count else 0.0
+
+
 def run_udp(log_queue, stop_event, auto_calibrate=False, target_velocity=5.0, shared_inc=None, shared_dec=None, **kwargs):
     """
     UDP 패킷을 수신하여 추상화된 제어 명령(스티어링, 속도)으로 변환 후 MUX로 전달합니다.
@@ -54,11 +85,10 @@ def run_udp(log_queue, stop_event, auto_calibrate=False, target_velocity=5.0, sh
 
     last_rx_time = time.time()
     last_log_time = 0.0
-    # 자동 보정용 윈도우 데이터 저장 (collections.deque 활용)
-    from collections import deque
+    # 자동 보정용 윈도우 데이터 저장 (누적합 기반 이동 평균)
     # runner.py에서 'window_packets'로 전달받음 (기본 8개 = 약 0.25초)
     window_len = kwargs.get("window_packets", 8)
-    speed_window = deque(maxlen=window_len)
+    speed_window = RingMean(max(1, window_len))
     
     # 초기값은 kwargs에서 가져오되, 루프 내에서는 shared_inc/dec를 참조함
     initial_inc = kwargs.get("increment", 0.001)   # Stall Recovery용
@@ -77,7 +107,7 @@ def run_udp(log_queue, stop_event, auto_calibrate=False, target_velocity=5.0, sh
             
             # 1초 주기 하트비트 진단 로그 (데이터 수신 여부와 상관없이 출력)
             if now - last_diag_time > 1.0:
-                avg_1s = sum(speed_window) / len(speed_window) if speed_window else 0.0
+                avg_1s = speed_window.mean()
                 rx_diff = now - last_rx_time
                 log_queue.put({
                     "type": "LOG", 
@@ -130,7 +160,7 @@ def run_udp(log_queue, stop_event, auto_calibrate=False, target_velocity=5.0, sh
                         
                         if speed_cmd >= 0.5:
                             if packet_counter >= window_len:
-                                avg_speed = sum(speed_window) / len(speed_window)
+                                avg_speed = speed_window.mean()
                                 
                                 adjust_msg = ""
                                 final_delta = 0.0
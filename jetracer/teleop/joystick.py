@@ -1,18 +1,157 @@
 #!/usr/bin/env python3
 import argparse
+import math
+import select
 import time
 
-import pygame
-
 from jetracer.core import NvidiaRacecar
 
+# Linux 에서는 evdev 로 /dev/input/eventN 을 직접 읽고, 없으면 pygame 으로 폴링
+try:
+    from evdev import InputDevice, ecodes, list_devices
+except ImportError:
+    InputDevice = None
+
 
 def clamp(x, lo=-1.0, hi=1.0):
     return lo if x < lo else hi if x > hi else x
 
 
 def apply_deadzone(v, dz):
-    return 0.0 if abs(v) < dz else v
+    # 데드존 밖을 0~1 로 재스케일 (경계에서 dz 만큼 점프하지 않음)
+    a = abs(v) - dz
+    return 0.0 if a <= 0.0 else math.copysign(a / (1.0 - dz), v)
+
+
+def norm_axis(val, lo, hi):
+    return (2.0 * (val - lo) / (hi - lo)) - 1.0
+
+
+def compute_commands(steer_raw, thr_raw, args):
+    """정규화된 축 값(-1..1) -> (steering_cmd, throttle_cmd)"""
+    steer = apply_deadzone(steer_raw, args.deadzone)
+    thr = apply_deadzone(thr_raw, args.deadzone)
+
+    if args.invert_steer:
+        steer = -steer
+    if args.invert_throttle:
+        thr = -thr
+
+    # ESC 중립점 및 후진 시작점 설정
+    ESC_NEUTRAL = 0.12  # 정지 상태
+    REVERSE_START = -0.1  # 후진 시작점
+
+    if thr > 0:
+        # 전진: 0 → 0.12, 1 → 1.0
+        throttle_cmd = ESC_NEUTRAL + thr * (1.0 - ESC_NEUTRAL) * args.throttle_scale
+    elif thr < 0:
+        # 후진: 0 → -0.1, -1 → -1.0
+        throttle_cmd = REVERSE_START + thr * (1.0 - abs(REVERSE_START)) * args.throttle_scale
+    else:
+        throttle_cmd = ESC_NEUTRAL  # 정지
+
+    # 안전 범위 클리핑
+    throttle_cmd = clamp(throttle_cmd)
+
+    steering_cmd = clamp(steer * args.steer_scale)
+    return steering_cmd, throttle_cmd
+
+
+def apply(car, args, steer_raw, thr_raw):
+    steering_cmd, throttle_cmd = compute_commands(steer_raw, thr_raw, args)
+    car.set_commands(steering_cmd, throttle_cmd)
+    print(
+        f"steer_axis[{args.steer_axis}]={steer_raw:+.2f} -> {steering_cmd:+.2f} | "
+        f"thr_axis[{args.throttle_axis}]={thr_raw:+.4f} -> {throttle_cmd:.4f}"
+    )
+
+
+# ---------- evdev ----------
+def find_device(path=None):
+    if path:
+        return InputDevice(path)
+    devices = [InputDevice(p) for p in list_devices()]
+    for kw in ("Xbox", "Gamepad", "Controller", "Joystick"):
+        for dev in devices:
+            if kw.lower() in dev.name.lower():
+                return dev
+    for dev in devices:
+        if ecodes.EV_ABS in dev.capabilities():
+            return dev
+    return None
+
+
+def run_evdev(car, args):
+    dev = find_device(args.device)
+    if dev is None:
+        raise RuntimeError("No joystick detected!")
+
+    # pygame/SDL 의 축 인덱스 = 장치가 가진 ABS 코드를 오름차순 정렬한 순서
+    # (ABS_HAT0X..ABS_HAT3Y 는 SDL 에서 축이 아니라 hat 으로 잡히므로 제외)
+    abs_caps = sorted(
+        (code, info)
+        for code, info in dev.capabilities(absinfo=True).get(ecodes.EV_ABS, [])
+        if not ecodes.ABS_HAT0X <= code <= ecodes.ABS_HAT3Y
+    )
+    n_axes = len(abs_caps)
+    print(f"Joystick: {dev.name} ({dev.path}) | axes={n_axes} [evdev]")
+    if args.steer_axis >= n_axes or args.throttle_axis >= n_axes:
+        raise RuntimeError(
+            f"축 개수({n_axes})보다 큰 인덱스가 지정됨: "
+            f"steer={args.steer_axis}, throttle={args.throttle_axis}"
+        )
+
+    steer_code, steer_info = abs_caps[args.steer_axis]
+    thr_code, thr_info = abs_caps[args.throttle_axis]
+    ranges = {steer_code: (steer_info.min, steer_info.max), thr_code: (thr_info.min, thr_info.max)}
+    axes = {
+        steer_code: norm_axis(steer_info.value, *ranges[steer_code]),
+        thr_code: norm_axis(thr_info.value, *ranges[thr_code]),
+    }
+
+    apply(car, args, axes[steer_code], axes[thr_code])
+    while True:
+        # 이벤트가 올 때만 깨어남 (고정 sleep 없음)
+        if not select.select([dev.fd], [], [], 0.02)[0]:
+            continue
+        changed = False
+        try:
+            for ev in dev.read():
+                if ev.type == ecodes.EV_ABS and ev.code in ranges:
+                    axes[ev.code] = norm_axis(ev.value, *ranges[ev.code])
+                    changed = True
+        except BlockingIOError:
+            pass
+        if changed:
+            apply(car, args, axes[steer_code], axes[thr_code])
+
+
+# ---------- pygame (fallback) ----------
+def run_pygame(car, args):
+    import pygame
+
+    pygame.init()
+    pygame.joystick.init()
+    try:
+        if pygame.joystick.get_count() == 0:
+            raise RuntimeError("No joystick detected!")
+
+        js = pygame.joystick.Joystick(0)
+        js.init()
+        n_axes = js.get_numaxes()
+        print(f"Joystick: {js.get_name()} | axes={n_axes} buttons={js.get_numbuttons()}")
+        if args.steer_axis >= n_axes or args.throttle_axis >= n_axes:
+            raise RuntimeError(
+                f"축 개수({n_axes})보다 큰 인덱스가 지정됨: "
+                f"steer={args.steer_axis}, throttle={args.throttle_axis}"
+            )
+
+        while True:
+            pygame.event.pump()
+            apply(car, args, js.get_axis(args.steer_axis), js.get_axis(args.throttle_axis))
+            time.sleep(0.03)
+    finally:
+        pygame.quit()
 
 
 def main():
@@ -25,77 +164,23 @@ def main():
     ap.add_argument("--throttle-mode", choices=["stick", "trigger"], default="stick", help="stick: -1..1 -> 0..1 매핑 / trigger: 0..1 가정")
     ap.add_argument("--steer-scale", type=float, default=1.0, help="steering scale (0~1)")
     ap.add_argument("--throttle-scale", type=float, default=0.125, help="throttle scale (0~1), 기본 최대 ~0.45 m/s")
+    ap.add_argument("--device", default=None, help="evdev 장치 경로 (예: /dev/input/event2, 기본: 자동 검색)")
+    ap.add_argument("--pygame", action="store_true", help="evdev 대신 pygame 으로 읽기")
     args = ap.parse_args()
 
-    pygame.init()
-    pygame.joystick.init()
-    if pygame.joystick.get_count() == 0:
-        raise RuntimeError("No joystick detected!")
-
-    js = pygame.joystick.Joystick(0)
-    js.init()
-    n_axes = js.get_numaxes()
-    print(f"Joystick: {js.get_name()} | axes={n_axes} buttons={js.get_numbuttons()}")
-    if args.steer_axis >= n_axes or args.throttle_axis >= n_axes:
-        raise RuntimeError(
-            f"축 개수({n_axes})보다 큰 인덱스가 지정됨: "
-            f"steer={args.steer_axis}, throttle={args.throttle_axis}"
-        )
-
     car = NvidiaRacecar()
-    car.steering = 0.0
-    car.throttle = 0.12  # ESC 중립점
+    car.set_commands(0.0, 0.12)  # ESC 중립점
 
     try:
-        while True:
-            pygame.event.pump()
-
-            steer_raw = js.get_axis(args.steer_axis)
-            thr_raw = js.get_axis(args.throttle_axis)
-
-            steer = apply_deadzone(steer_raw, args.deadzone)
-            thr = apply_deadzone(thr_raw, args.deadzone)
-
-            if args.invert_steer:
-                steer = -steer
-            if args.invert_throttle:
-                thr = -thr
-
-            # ESC 중립점 및 후진 시작점 설정
-            ESC_NEUTRAL = 0.12  # 정지 상태
-            REVERSE_START = -0.1  # 후진 시작점
-            
-            if thr > 0:
-                # 전진: 0 → 0.12, 1 → 1.0
-                throttle_cmd = ESC_NEUTRAL + thr * (1.0 - ESC_NEUTRAL) * args.throttle_scale
-            elif thr < 0:
-                # 후진: 0 → -0.1, -1 → -1.0
-                throttle_cmd = REVERSE_START + thr * (1.0 - abs(REVERSE_START)) * args.throttle_scale
-            else:
-                throttle_cmd = ESC_NEUTRAL  # 정지
-            
-            # 안전 범위 클리핑
-            throttle_cmd = max(-1.0, min(1.0, throttle_cmd))
-            
-            steering_cmd = clamp(steer * args.steer_scale)
-
-            car.steering = steering_cmd
-            car.throttle = throttle_cmd
-
-            print(
-                f"steer_axis[{args.steer_axis}]={steer_raw:+.2f} -> {steering_cmd:+.2f} | "
-                f"thr_axis[{args.throttle_axis}]={thr_raw:+.4f} -> {throttle_cmd:.4f}"
-            )
-            time.sleep(0.03)
-
+        if InputDevice is not None and not args.pygame:
+            run_evdev(car, args)
+        else:
+            run_pygame(car, args)
     except KeyboardInterrupt:
         print("Exiting...")
     finally:
-        car.steering = 0.0
-        car.throttle = 0.12  # ESC 중립점
-        pygame.quit()
+        car.set_commands(0.0, 0.12)  # ESC 중립점
 
 
 if __name__ == "__main__":
     main()
-
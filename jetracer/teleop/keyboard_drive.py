@@ -1,30 +1,58 @@
 # keyboard drive teleop (throttle + steering)
+import os
 import sys
+import time
+from contextlib import contextmanager
 
 from jetracer.core import NvidiaRacecar
 
+# 키 입력 대기 최대 시간. 입력이 없어도 이 주기로 루프가 돌며 명령을 다시 확인함
+KEY_POLL_SEC = 0.02
+
 try:
     import msvcrt
 
-    def _getch():
+    @contextmanager
+    def _key_mode():
+        yield
+
+    def _getch(timeout=None):
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+            while not msvcrt.kbhit():
+                if time.monotonic() >= deadline:
+                    return ""
+                time.sleep(0.005)
         try:
             return msvcrt.getch().decode("utf-8").lower()
         except UnicodeDecodeError:
             return ""
 
 except ImportError:
+    import select
     import termios
     import tty
 
-    def _getch():
+    @contextmanager
+    def _key_mode():
+        """
+        main() 동안 터미널을 한 번만 cbreak 모드로 전환합니다 (키마다 tcsetattr 하지 않음).
+        raw 대신 cbreak 를 써서 print 줄바꿈과 Ctrl+C 는 그대로 동작합니다.
+        """
         fd = sys.stdin.fileno()
         old = termios.tcgetattr(fd)
         try:
-            tty.setraw(fd)
-            ch = sys.stdin.read(1).lower()
+            tty.setcbreak(fd)
+            yield
         finally:
             termios.tcsetattr(fd, termios.TCSADRAIN, old)
-        return ch
+
+    def _getch(timeout=None):
+        # TextIOWrapper 버퍼에 남은 키를 select 가 못 보는 일이 없도록 fd 에서 직접 1바이트 읽음
+        fd = sys.stdin.fileno()
+        if timeout is not None and not select.select([fd], [], [], timeout)[0]:
+            return ""
+        return os.read(fd, 1).decode("utf-8", "ignore").lower()
 
 
 def clamp(value, minimum=-1.0, maximum=1.0):
@@ -57,41 +85,41 @@ def main(throttle_step=0.001, steering_step=0.05, throttle_scale=0.165):
     car = NvidiaRacecar()
     throttle_input = 0.2  # logical -1..1
     steering = 0.0
-    car.throttle = _compute_throttle_cmd(throttle_input, throttle_scale)
-    car.steering = steering
+    car.set_commands(steering, _compute_throttle_cmd(throttle_input, throttle_scale))
     print("Keyboard drive control")
     print("w/s: throttle ±step, a/d: steering ±step, r: reset, q: quit")
     print(f"steps -> throttle:{throttle_step} steering:{steering_step}")
     print(f"ESC neutral mapping enabled (scale={throttle_scale})")
-    try:
-        while True:
-            key = _getch()
-            if not key:
-                continue
-            if key == "w":
-                throttle_input = clamp(throttle_input + throttle_step, -1.0, 1.0)
-            elif key == "s":
-                throttle_input = clamp(throttle_input - throttle_step, -1.0, 1.0)
-            elif key == "a":
-                steering = clamp(steering + steering_step)
-            elif key == "d":
-                steering = clamp(steering - steering_step)
-            elif key == "r":
-                throttle_input = 0.0
-                steering = 0.0
-            elif key == "q":
-                break
-            else:
-                continue
-
-            car.throttle = _compute_throttle_cmd(throttle_input, throttle_scale)
-            car.steering = steering
-            print(f"throttle_in={throttle_input:.4f} throttle_cmd={car.throttle:.4f} steering={steering:.2f}")
-    except KeyboardInterrupt:
-        print("Ctrl+C pressed, stopping")
-    finally:
-        car.throttle = _compute_throttle_cmd(0.0, throttle_scale)
-        car.steering = 0.0
+    with _key_mode():
+        try:
+            while True:
+                key = _getch(KEY_POLL_SEC)
+                if not key:
+                    # 입력 없음: 마지막 명령 유지 (값이 같으면 I2C 쓰기는 생략됨)
+                    car.set_commands(steering, _compute_throttle_cmd(throttle_input, throttle_scale))
+                    continue
+                if key == "w":
+                    throttle_input = clamp(throttle_input + throttle_step, -1.0, 1.0)
+                elif key == "s":
+                    throttle_input = clamp(throttle_input - throttle_step, -1.0, 1.0)
+                elif key == "a":
+                    steering = clamp(steering + steering_step)
+                elif key == "d":
+                    steering = clamp(steering - steering_step)
+                elif key == "r":
+                    throttle_input = 0.0
+                    steering = 0.0
+                elif key == "q":
+                    break
+                else:
+                    continue
+
+                car.set_commands(steering, _compute_throttle_cmd(throttle_input, throttle_scale))
+                print(f"throttle_in={throttle_input:.4f} throttle_cmd={car.throttle:.4f} steering={steering:.2f}")
+        except KeyboardInterrupt:
+            print("Ctrl+C pressed, stopping")
+        finally:
+            car.set_commands(0.0, _compute_throttle_cmd(0.0, throttle_scale))
 
 
 if __name__ == "__main__":
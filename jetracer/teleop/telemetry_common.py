@@ -14,7 +14,15 @@ from __future__ import annotations
 import os
 import re
 import struct
-from typing import Optional, Tuple
+import threading
+import time
+from bisect import bisect_right
+from typing import Dict, Optional, Tuple
+
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except ImportError:
+    INotify = None
 
 # =========================
 # Battery SOC helpers
@@ -31,29 +39,164 @@ SOC_TABLE = [
 ]
 
 
+# ascending copies of SOC_TABLE for bisect
+_SOC_V = [v for v, _ in reversed(SOC_TABLE)]
+_SOC_P = [s for _, s in reversed(SOC_TABLE)]
+
+
 def soc_from_voltage(pack_v: float, cells: int = 2) -> int:
     vpc = pack_v / max(1, cells)
-    if vpc >= 4.20:
-        return 100
-    if vpc <= 3.00:
-        return 0
-    for (vh, sh), (vl, sl) in zip(SOC_TABLE, SOC_TABLE[1:]):
-        if vl <= vpc <= vh:
-            t = (vpc - vl) / (vh - vl)
-            return int(sl + t * (sh - sl))
-    return 0
-
-
-def read_float_file(path: str) -> Optional[float]:
+    if vpc >= _SOC_V[-1]:
+        return _SOC_P[-1]
+    if vpc <= _SOC_V[0]:
+        return _SOC_P[0]
+    # _SOC_V[i-1] <= vpc < _SOC_V[i]
+    i = bisect_right(_SOC_V, vpc)
+    vl, vh = _SOC_V[i - 1], _SOC_V[i]
+    sl, sh = _SOC_P[i - 1], _SOC_P[i]
+    t = (vpc - vl) / (vh - vl)
+    return int(sl + t * (sh - sl))
+
+
+# Within FLOAT_FILE_TTL seconds of the last check the cached value is returned
+# without any syscall; after that, the file is only re-read if its mtime changed.
+FLOAT_FILE_TTL = 0.2
+
+# path -> (checked_at, st_mtime_ns, value)
+_float_file_cache: Dict[str, Tuple[float, int, float]] = {}
+
+# path -> (fd, st_ino); kept open and read with pread instead of open/read/close.
+# mmap is avoided on purpose: the writer truncates the file on every update,
+# and touching a mapping past EOF raises SIGBUS.
+_float_file_fds: Dict[str, Tuple[int, int]] = {}
+_FLOAT_FILE_MAX = 32
+
+
+def _shm_fd(path: str, ino: int) -> int:
+    entry = _float_file_fds.get(path)
+    if entry is None or entry[1] != ino:
+        # first use, or the file was replaced (new inode)
+        if entry is not None:
+            try:
+                os.close(entry[0])
+            except OSError:
+                pass
+        entry = (os.open(path, os.O_RDONLY), ino)
+        _float_file_fds[path] = entry
+    return entry[0]
+
+
+def _pread_float(path: str, ino: int) -> float:
+    data = os.pread(_shm_fd(path, ino), _FLOAT_FILE_MAX, 0)
+    return float(data.split(b"\0", 1)[0].strip())
+
+
+def read_float_file(path: str, ttl: float = FLOAT_FILE_TTL) -> Optional[float]:
+    now = time.monotonic()
+    cached = _float_file_cache.get(path)
+    if cached is not None and now - cached[0] < ttl:
+        return cached[2]
+
     try:
-        with open(path, "r") as f:
-            return float(f.read().strip())
+        st = os.stat(path)
+    except OSError:
+        return None
+    mtime = st.st_mtime_ns
+
+    if cached is not None and cached[1] == mtime:
+        _float_file_cache[path] = (now, mtime, cached[2])
+        return cached[2]
+
+    try:
+        value = _pread_float(path, st.st_ino)
     except Exception:
         return None
 
+    _float_file_cache[path] = (now, mtime, value)
+    return value
 
-def read_voltage(shm_path: str = "/dev/shm/jetracer_voltage") -> Optional[float]:
-    return read_float_file(shm_path)
+
+def read_voltage(
+    shm_path: str = "/dev/shm/jetracer_voltage",
+    ttl: float = FLOAT_FILE_TTL,
+) -> Optional[float]:
+    return read_float_file(shm_path, ttl)
+
+
+class VoltageSampler:
+    """
+    Background thread that keeps `.value` (a plain float / None) up to date.
+    Hot loops read `.value` instead of touching the file.
+
+    With inotify_simple installed the thread sleeps until the writer updates
+    the file (IN_MODIFY, or IN_CLOSE_WRITE for open/write/close writers);
+    otherwise, or while the file does not exist, it re-reads the file every
+    `period` seconds.
+    """
+
+    # upper bound on a blocking inotify read, so stop() is honoured promptly
+    INOTIFY_TIMEOUT = 1.0
+
+    def __init__(self, shm_path: str = "/dev/shm/jetracer_voltage", period: float = 0.5):
+        self.shm_path = shm_path
+        self.period = period
+        self.value: Optional[float] = read_voltage(shm_path)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="voltage-sampler", daemon=True)
+
+    def start(self) -> "VoltageSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=max(self.period, self.INOTIFY_TIMEOUT) + 0.5)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            ino = self._watch()
+            if ino is None:
+                if self._stop.wait(self.period):
+                    return
+                self.value = read_voltage(self.shm_path)
+                continue
+            try:
+                self._run_inotify(ino)
+            finally:
+                ino.close()
+
+    def _watch(self):
+        if INotify is None:
+            return None
+        try:
+            ino = INotify()
+        except OSError:
+            return None
+        try:
+            ino.add_watch(
+                self.shm_path,
+                inotify_flags.MODIFY | inotify_flags.CLOSE_WRITE
+                | inotify_flags.DELETE_SELF | inotify_flags.MOVE_SELF,
+            )
+        except OSError:
+            ino.close()
+            return None
+        # pick up anything written before the watch was in place
+        self.value = read_voltage(self.shm_path, ttl=0.0)
+        return ino
+
+    def _run_inotify(self, ino) -> None:
+        gone = inotify_flags.DELETE_SELF | inotify_flags.MOVE_SELF | inotify_flags.IGNORED
+        timeout_ms = int(self.INOTIFY_TIMEOUT * 1000)
+        while not self._stop.is_set():
+            events = ino.read(timeout=timeout_ms)
+            if not events:
+                continue
+            if any(e.mask & gone for e in events):
+                # file removed/replaced: re-arm the watch (or fall back to polling)
+                return
+            self.value = read_voltage(self.shm_path, ttl=0.0)
 
 
 def read_battery_pct(
@@ -100,16 +243,16 @@ _HEADING_FMT = "ffI"
 _HEADING_SIZE = struct.calcsize(_HEADING_FMT)
 
 def read_heading_delta(shm_path="/dev/shm/jetracer_heading_delta"):
+    # same persistent-fd + pread path as the voltage file (no file object per call)
     try:
-        with open(shm_path, "rb") as f:
-            data = f.read(_HEADING_SIZE)
-            if len(data) != _HEADING_SIZE:
-                return None, None, None
+        data = os.pread(_shm_fd(shm_path, os.stat(shm_path).st_ino), _HEADING_SIZE, 0)
+        if len(data) != _HEADING_SIZE:
+            return None, None, None
 
-            heading_diff, heading_dt, heading_seq = struct.unpack(
-                _HEADING_FMT, data
-            )
-            return float(heading_diff), float(heading_dt), int(heading_seq)
+        heading_diff, heading_dt, heading_seq = struct.unpack(
+            _HEADING_FMT, data
+        )
+        return float(heading_diff), float(heading_dt), int(heading_seq)
     except Exception:
         return None, None, None
 
@@ -13,10 +13,22 @@ from jetracer.teleop.telemetry_common import infer_car_number, read_voltage
 
 # vehicle_id(int32), voltage(float32), dyaw(float32), dt(float32), seq(uint32)
 FMT_UPLINK = "!ifffI"
+UPLINK = struct.Struct(FMT_UPLINK)
 
 MAX_YAW_RATE = 6.0       # rad/s
 HARD_RESET_DT = 0.30     # silence/gap threshold
 
+# "#XYMU=<payload>#" (앞뒤 공백/CR 허용)
+_XYMU_PREFIX = b"#XYMU="
+_XYMU_PREFIX_LEN = len(_XYMU_PREFIX)
+
+def xymu_payload(raw: bytes) -> Optional[bytes]:
+    """프레임이 맞으면 '#XYMU=' 와 끝 '#' 사이 payload 를, 아니면 None 을 반환"""
+    s = raw.strip()
+    if len(s) <= _XYMU_PREFIX_LEN or s[:_XYMU_PREFIX_LEN] != _XYMU_PREFIX or s[-1:] != b"#":
+        return None
+    return s[_XYMU_PREFIX_LEN:-1]
+
 def quat_dot(q1: Tuple[float, float, float, float],
              q2: Tuple[float, float, float, float]) -> float:
     return q1[0]*q2[0] + q1[1]*q2[1] + q1[2]*q2[2] + q1[3]*q2[3]
@@ -58,7 +70,8 @@ def build_parser() -> argparse.ArgumentParser:
     p.add_argument("--imu-hz", type=float, default=100.0, help="Nominal IMU output rate")
     p.add_argument("--imu-port", default="/dev/ttyACM0")
     p.add_argument("--imu-baud", type=int, default=115200)
-    p.add_argument("--poll-sleep", type=float, default=0.001)
+    p.add_argument("--poll-sleep", type=float, default=0.001,
+                   help="Max wait for serial data when idle (serial read timeout)")
     p.add_argument("--yaw-scale", type=float, default=1.0)
     p.add_argument("--verbose", action="store_true")
     return p
@@ -71,11 +84,18 @@ def main() -> None:
     target = (args.server_ip, args.server_port)
 
     try:
-        ser = serial.Serial(args.imu_port, args.imu_baud, timeout=0)
+        # 데이터가 없을 때만 poll_sleep 만큼 블로킹 (sleep 폴링 대신 첫 바이트 도착 즉시 깨어남)
+        ser = serial.Serial(args.imu_port, args.imu_baud, timeout=args.poll_sleep)
     except Exception as e:
         print(f"[ERROR] IMU Connection Failed: {e}")
         return
 
+    # USB 시리얼 저지연 모드 (Linux 전용, 실패 시 무시)
+    try:
+        ser.set_low_latency_mode(True)
+    except (AttributeError, NotImplementedError, ValueError, OSError):
+        pass
+
     # nominal dt
     sub_dt_nom = 1.0 / max(1.0, float(args.imu_hz))
 
@@ -89,6 +109,9 @@ def main() -> None:
     seq = 0
     total_yaw = 0.0
 
+    # 업링크 패킷 버퍼를 한 번만 만들고 매 버스트마다 pack_into 로 덮어씀
+    pkt = bytearray(UPLINK.size)
+
     # consecutive spike counter (for self-healing)
     spike_streak = 0
     SPIKE_STREAK_RESET = 8
@@ -97,11 +120,9 @@ def main() -> None:
 
     try:
         while True:
-            # ---- non-blocking read ----
+            # ---- bulk read: 쌓인 만큼 한 번에, 없으면 1바이트를 timeout 까지 대기 ----
             try:
-                waiting = ser.in_waiting
-                if waiting > 0:
-                    serial_buffer.extend(ser.read(waiting))
+                serial_buffer += ser.read(ser.in_waiting or 1)
             except Exception:
                 pass
 
@@ -114,7 +135,6 @@ def main() -> None:
                 if time.monotonic() - last_success_t > HARD_RESET_DT:
                     prev_q = None
                     spike_streak = 0
-                time.sleep(args.poll_sleep)
                 continue
 
             parts = serial_buffer.split(b"\n")
@@ -123,11 +143,11 @@ def main() -> None:
             # parse all valid quaternions
             q_list: list[Tuple[float, float, float, float]] = []
             for raw in parts[:-1]:
-                line = raw.strip()
-                if not (line.startswith(b"#XYMU=") and line.endswith(b"#")):
+                payload = xymu_payload(raw)
+                if payload is None:
                     continue
                 try:
-                    d = line[6:-1].split(b",")
+                    d = payload.split(b",")
                     if len(d) < 7:
                         continue
                     q_raw = (float(d[3]), float(d[4]), float(d[5]), float(d[6]))  # w,x,y,z
@@ -201,8 +221,8 @@ def main() -> None:
             seq += 1
             voltage = read_voltage(args.battery_shm_path) or 0.0
 
-            pkt = struct.pack(
-                FMT_UPLINK,
+            UPLINK.pack_into(
+                pkt, 0,
                 int(vehicle_id),
                 float(voltage),
                 float(burst_dyaw),
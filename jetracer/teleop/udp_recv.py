@@ -119,8 +119,7 @@ def main():
 
     # 차량 초기화
     car = NvidiaRacecar()
-    car.steering = 0.0          # nvidia_racecar.py의 steering_offset이 적용됨
-    car.throttle = 0.12         # ESC 중립점
+    car.set_commands(0.0, 0.12)  # steering_offset 적용 / ESC 중립점
 
     # 소켓 초기화 (non-blocking)
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -196,8 +195,7 @@ def main():
                 else:
                     throttle_cmd = ESC_NEUTRAL
 
-                car.steering = steer_norm
-                car.throttle = throttle_cmd
+                car.set_commands(steer_norm, throttle_cmd)
 
                 # 로그 출력
                 now = time.time()
@@ -213,8 +211,7 @@ def main():
             now = time.time()
             if (now - last_rx_ts) > args.watchdog:
                 if latest_data is not None:
-                    car.steering = 0.0
-                    car.throttle = 0.12
+                    car.set_commands(0.0, 0.12)
                     if args.verbose:
                         print(f"[watchdog] no packets > {args.watchdog:.2f}s → steering=0.0, throttle=0.12")
                     latest_data = None
@@ -227,8 +224,7 @@ def main():
         print("\n[UDP] interrupted")
     finally:
         try:
-            car.throttle = 0.12
-            car.steering = 0.0
+            car.set_commands(0.0, 0.12)
         except Exception:
             pass
         sock.close()
@@ -0,0 +1,93 @@
+"""
+IMU CSV 로그(imu_reader.py 출력) 오프라인 yaw 분석 도구.
+
+- 쿼터니언 열(qw, qx, qy, qz)을 한 번에 읽어 설치각 보정(q_offset)을 전체 배열에 적용
+- numpy-quaternion 이 있으면 quaternion dtype 으로, 없으면 순수 numpy 로 일괄 계산
+- yaw 통계(평균/표준편차/범위/드리프트)를 출력하고 필요하면 CSV 로 저장
+
+사용 예:
+    python -m jetracer.tools.analyze_log imu_log_20251212_015611.csv --out yaw.csv
+"""
+import argparse
+import sys
+
+import numpy as np
+
+try:
+    import quaternion  # numpy-quaternion
+except ImportError:
+    quaternion = None
+
+# imu_reader.py CSV 기준 쿼터니언 열 (w, x, y, z)
+QUAT_COLS = [10, 11, 12, 13]
+
+# 9DOF_Razor_IMU/Firmware 스크립트와 동일한 설치각 보정값
+DEFAULT_Q_OFFSET = (0.0180163, 0.9926568, -0.11775514, 0.02101488)
+
+
+def load_quaternions(filename):
+    """CSV 에서 (N, 4) [w, x, y, z] 배열을 읽고 행 단위로 정규화합니다."""
+    data = np.loadtxt(filename, delimiter=",", skiprows=1, usecols=QUAT_COLS, ndmin=2)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    return data
+
+
+def corrected_yaw_deg(q_arr, q_offset):
+    """q_offset ⊗ q 를 전체 배열에 적용한 뒤 ZYX yaw(deg) 배열을 반환합니다."""
+    q_off = np.asarray(q_offset, dtype=np.float64)
+    q_off = q_off / np.linalg.norm(q_off)
+
+    if quaternion is not None:
+        # as_quat_array 는 C-contiguous 입력이 필요
+        q = quaternion.as_quat_array(np.ascontiguousarray(q_arr))
+        q_corr = quaternion.as_float_array(quaternion.from_float_array(q_off) * q)
+    else:
+        w1, x1, y1, z1 = q_off
+        w2, x2, y2, z2 = q_arr.T
+        q_corr = np.stack([
+            w1*w2 - x1*x2 - y1*y2 - z1*z2,
+            w1*x2 + x1*w2 + y1*z2 - z1*y2,
+            w1*y2 - x1*z2 + y1*w2 + z1*x2,
+            w1*z2 + x1*y2 - y1*x2 + z1*w2,
+        ], axis=1)
+
+    w, x, y, z = q_corr.T
+    return np.degrees(np.arctan2(2*(w*z + x*y), 1 - 2*(y*y + z*z)))
+
+
+def analyze_log(filename, q_offset=DEFAULT_Q_OFFSET, out=None):
+    q_arr = load_quaternions(filename)
+    if len(q_arr) == 0:
+        print(f"[ANALYZE] {filename}: 데이터 없음")
+        return None
+
+    yaw = corrected_yaw_deg(q_arr, q_offset)
+    yaw_unwrapped = np.degrees(np.unwrap(np.radians(yaw)))
+
+    backend = "numpy-quaternion" if quaternion is not None else "numpy"
+    print(f"[ANALYZE] {filename} ({len(yaw)} samples, {backend})")
+    print(f"  yaw mean : {yaw.mean():8.3f}°")
+    print(f"  yaw std  : {yaw.std():8.3f}°")
+    print(f"  yaw range: {yaw.min():8.3f}° ~ {yaw.max():8.3f}°")
+    print(f"  drift    : {yaw_unwrapped[-1] - yaw_unwrapped[0]:+8.3f}° (first → last, unwrapped)")
+
+    if out:
+        np.savetxt(out, yaw, delimiter=",", fmt="%.6f", header="yaw_deg", comments="")
+        print(f"[ANALYZE] yaw 저장: {out}")
+    return yaw
+
+
+def main():
+    p = argparse.ArgumentParser(description="IMU CSV yaw 일괄 분석")
+    p.add_argument("filename", help="imu_reader.py 로 기록한 CSV")
+    p.add_argument("--offset", type=float, nargs=4, metavar=("W", "X", "Y", "Z"),
+                   default=DEFAULT_Q_OFFSET, help="설치각 보정 쿼터니언")
+    p.add_argument("--out", default=None, help="보정된 yaw 를 저장할 CSV 경로")
+    args = p.parse_args()
+
+    if analyze_log(args.filename, args.offset, args.out) is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()